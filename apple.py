@@ -1,10 +1,9 @@
-import pygame
 from config import *
 
 
 class Apple:
     """"
-    Creates a colored square that represents an apple.
+    A square on the grid that represents an apple.
 
     A point is scored when the snake collides with an apple
     Red colored apples slightly grow the snake.
@@ -15,39 +14,28 @@ class Apple:
 
     Attributes
     ----------
-    image : pygame.Surface
-        a graphic representing the apple
-    rect : pygame.Rect
-        coordinates of apple
+    x : int
+        horizontal position of the apple on the grid, in pixels
+    y : int
+        vertical position of the apple on the grid, in pixels
     color : tuple of int
         rgb color of the apple
-    eaten_sound: Sound
-        the sound that is played whenever the snake collides with the apple
+    is_placed : bool
+        whether the apple is currently on the grid
 
     Methods
     -------
     move_to(x, y)
         Move the apple to the specified location on the grid
-    draw(surface)
-        Draw the apple to the screen
     """
+    size = TILE_WIDTH_PIXELS
+
     def __init__(self, color):
-        self.image = pygame.Surface((TILE_WIDTH_PIXELS, TILE_WIDTH_PIXELS)).convert()
-        self.image.fill(color)
-        self.rect = self.image.get_rect()
+        self.x = 0
+        self.y = 0
         self.color = color
-        self.eaten_sound = self._assign_sound()
-
-    def _assign_sound(self):
-        if self.color == RED:
-            return pygame.mixer.Sound(SOUND_PATH + BEEP1_SOUND)
-        elif self.color == POISON:
-            return pygame.mixer.Sound(SOUND_PATH + BEEP2_SOUND)
-        elif self.color == GOLDEN:
-            return pygame.mixer.Sound(SOUND_PATH + GLOSS_SOUND)
+        self.is_placed = False
 
     def move_to(self, x, y):
-        self.rect.topleft = x, y
-
-    def draw(self, surface):
-        surface.blit(self.image, self.rect)
\ No newline at end of file
+        self.x = x
+        self.y = y
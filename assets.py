@@ -0,0 +1,119 @@
+import io
+import os
+import threading
+import pygame
+from config import *
+
+
+class AssetRegistry:
+    """
+    Loads each sound, font, and image from disk once and hands out that same object from then on.
+
+    Everything the game plays, writes with, or shows is asked for through here by the name of its file,
+    and for fonts and images also by the size wanted. Calling preload() once the display is set up loads
+    everything the game uses, so no file is read once a game is underway. preload_in_background() reads
+    the files on a thread of its own, so the start menu can be shown while the rest is read. Pygame
+    mustn't be called from more than one thread, so only the reading is done there; the sounds, fonts,
+    and images are made from what was read on the main thread, the first time each is asked for.
+
+    ...
+
+    Attributes
+    ----------
+    hits : int
+        how many assets were handed out without reading a file
+    misses : int
+        how many assets had to be loaded from disk
+
+    Methods
+    -------
+    sound(name)
+        the sound from the sounds folder with the given file name
+    font(name, size)
+        the font from the fonts folder with the given file name, at the given point size
+    image(name, scale=1, alpha=False, colorkey=False, smooth=False)
+        the image from the images folder with the given file name, scaled by scale
+    preload()
+        load every sound, font, and image the game uses
+    preload_in_background()
+        start reading the file of every sound, font, and image the game uses on a background thread
+    wait_for_preload()
+        wait until the background thread is done reading
+    """
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._assets = {}
+        self._files = {}
+        self._preloader = None
+
+    def sound(self, name):
+        path = SOUND_PATH + name
+        return self._get((path,), lambda: pygame.mixer.Sound(self._open(path)))
+
+    def font(self, name, size):
+        path = FONT_PATH + name
+        return self._get((path, size), lambda: pygame.font.Font(self._open(path), size))
+
+    def image(self, name, scale=1, alpha=False, colorkey=False, smooth=False):
+        """
+        Load an image, converted for fast drawing to the screen.
+
+        alpha keeps the image's transparency, colorkey makes its top left color see-through, and smooth
+        scales it with filtering. The display has to be set up before an image can be loaded.
+        """
+        path = os.path.join(IMAGE_PATH, name)
+        return self._get((path, scale, alpha, colorkey, smooth),
+                         lambda: _load_image(self._open(path), path, scale, alpha, colorkey, smooth))
+
+    def preload(self):
+        for name in PRELOADED_SOUNDS:
+            self.sound(name)
+        for size in PRELOADED_FONT_SIZES:
+            self.font(STANDARD_FONT, size)
+        for name, options in PRELOADED_IMAGES:
+            self.image(name, **options)
+
+    def preload_in_background(self):
+        if self._preloader is None:
+            self._preloader = threading.Thread(target=self._read_files, name="preload", daemon=True)
+            self._preloader.start()
+
+    def wait_for_preload(self):
+        if self._preloader is not None:
+            self._preloader.join()
+
+    def _get(self, key, load):
+        asset = self._assets.get(key)
+        if asset is None:
+            self.misses += 1
+            asset = self._assets[key] = load()
+        else:
+            self.hits += 1
+        return asset
+
+    def _open(self, path):
+        """The file at path as read in the background, or just its path if it hasn't been read yet."""
+        contents = self._files.get(path)
+        return path if contents is None else io.BytesIO(contents)
+
+    def _read_files(self):
+        paths = [SOUND_PATH + name for name in PRELOADED_SOUNDS] + [FONT_PATH + STANDARD_FONT]
+        paths += sorted({os.path.join(IMAGE_PATH, name) for name, _ in PRELOADED_IMAGES})
+        for path in paths:
+            with open(path, "rb") as asset_file:
+                self._files[path] = asset_file.read()
+
+
+def _load_image(file, path, scale, alpha, colorkey, smooth):
+    image = pygame.image.load(file, path)
+    image = image.convert_alpha() if alpha else image.convert()
+    if colorkey:
+        image.set_colorkey(image.get_at((0, 0)), pygame.RLEACCEL)
+    if scale != 1:
+        size = (int(image.get_width() * scale), int(image.get_height() * scale))
+        image = pygame.transform.smoothscale(image, size) if smooth else pygame.transform.scale(image, size)
+    return image
+
+
+assets = AssetRegistry()
@@ -0,0 +1,309 @@
+import numpy as np
+
+from config import *
+from wall import BrickWall
+
+UP, RIGHT, DOWN, LEFT = range(4)
+NO_TURN = -1
+COLUMN_STEPS = np.array([0, 1, 0, -1])
+ROW_STEPS = np.array([-1, 0, 1, 0])
+
+EMPTY_TILE, WALL_TILE, BODY_TILE, HEAD_TILE, RED_APPLE_TILE, POISON_APPLE_TILE, GOLDEN_APPLE_TILE = range(7)
+POISON_APPLE, GOLDEN_APPLE = POISON_APPLE_TILE, GOLDEN_APPLE_TILE
+
+APPLE_REWARD = 1.0
+DEATH_REWARD = -1.0
+WIN_REWARD = 10.0
+INITIAL_APPLE_SLOTS = 16
+PLACEMENT_ATTEMPTS = 8
+
+
+class BatchEnvironment:
+    """
+    Many independent games of snake played in lockstep, with the state of every game held in NumPy arrays.
+
+    The rules are the ones Grid and Snake play by, at the resolution of whole tiles: one step moves each
+    snake one tile, which takes a Snake three updates. Growth is kept in the same units as a Snake's
+    elongation cycles, so a red apple still grows the snake by elongation_factor pieces, three to a tile.
+    Apple spawn and despawn chances are scaled to match the three updates a step stands for.
+
+    All of the games share one grid size and wall. A game's snake stays still until it is first given a
+    direction, and once a game is done it ignores its actions until it is reset. Like a Grid, a game holds
+    any number of golden and poison apples; when one spawns in a game whose apple slots are all taken,
+    every game gets twice the slots.
+
+    ...
+
+    Attributes
+    ----------
+    number_of_games : int
+        how many games are played at once
+    columns : int
+        the number of tiles across each grid
+    rows : int
+        the number of tiles down each grid
+    walls : numpy.ndarray of bool
+        for every tile, whether the wall covers it
+    initial_elongation_factor : int
+        the elongation factor every snake starts with
+    occupancy : numpy.ndarray of uint8
+        for every game and tile, whether the snake covers the tile
+    heads : numpy.ndarray of int
+        the tile of each snake's head
+    directions : numpy.ndarray of int
+        the direction each snake travels in, NO_TURN if it has not started moving
+    bodies : numpy.ndarray of int
+        each snake's body tiles, stored as a ring buffer starting at the piece right behind the head
+    body_fronts : numpy.ndarray of int
+        where each snake's body starts in its ring buffer
+    body_lengths : numpy.ndarray of int
+        the number of body tiles each snake has
+    elongation_cycles_remaining : numpy.ndarray of int
+        how many more pieces each snake still has to grow by
+    elongation_factors : numpy.ndarray of int
+        how many pieces each snake grows by when it eats a red apple
+    red_apples : numpy.ndarray of int
+        the tile of each game's red apple, -1 if there is no room for it
+    apple_tiles : numpy.ndarray of int
+        the tiles of each game's golden and poison apples, -1 for an empty slot
+    apple_kinds : numpy.ndarray of int
+        POISON_APPLE or GOLDEN_APPLE for each apple slot
+    other_apple_spawn_rates : numpy.ndarray of float
+        the chance each step that a golden or poison apple spawns in each game
+    other_apple_despawn_rates : numpy.ndarray of float
+        the chance each step that a golden or poison apple is removed from each game
+    scores : numpy.ndarray of int
+        points earned in each game's current level
+    levels : numpy.ndarray of int
+        each game's level
+    steps : numpy.ndarray of int
+        how many steps each game has been played for
+    dones : numpy.ndarray of bool
+        whether each game is over
+    wins : numpy.ndarray of bool
+        whether each game was won
+
+    Methods
+    -------
+    reset(games=None)
+        start the given games, or all of them, over from the first level
+    step(actions)
+        turn each snake as asked and advance every game by one tile, returns the rewards and done flags
+    observe()
+        return every game's grid as an array of tile codes
+    """
+    def __init__(self, number_of_games, grid_dimensions_in_tiles, elongation_factor, seed=None):
+        self.number_of_games = number_of_games
+        self.columns, self.rows = grid_dimensions_in_tiles
+        self.random = np.random.default_rng(seed)
+        self.walls = self._build_walls()
+        self.initial_elongation_factor = elongation_factor
+        tiles = self.columns * self.rows
+        self.occupancy = np.zeros((number_of_games, tiles), np.uint8)
+        self.heads = np.zeros(number_of_games, np.int64)
+        self.directions = np.full(number_of_games, NO_TURN, np.int64)
+        self.bodies = np.zeros((number_of_games, tiles), np.int32)
+        self.body_fronts = np.zeros(number_of_games, np.int64)
+        self.body_lengths = np.zeros(number_of_games, np.int64)
+        self.elongation_cycles_remaining = np.zeros(number_of_games, np.int64)
+        self.elongation_factors = np.zeros(number_of_games, np.int64)
+        self.red_apples = np.full(number_of_games, -1, np.int64)
+        self.apple_tiles = np.full((number_of_games, INITIAL_APPLE_SLOTS), -1, np.int64)
+        self.apple_kinds = np.zeros((number_of_games, INITIAL_APPLE_SLOTS), np.int8)
+        self.other_apple_spawn_rates = np.zeros(number_of_games)
+        self.other_apple_despawn_rates = np.zeros(number_of_games)
+        self.scores = np.zeros(number_of_games, np.int64)
+        self.levels = np.zeros(number_of_games, np.int64)
+        self.steps = np.zeros(number_of_games, np.int64)
+        self.dones = np.zeros(number_of_games, bool)
+        self.wins = np.zeros(number_of_games, bool)
+        self.reset()
+
+    def reset(self, games=None):
+        games = np.arange(self.number_of_games) if games is None else np.asarray(games, np.int64)
+        self.occupancy[games] = 0
+        self.directions[games] = NO_TURN
+        self.body_fronts[games] = 0
+        self.body_lengths[games] = 0
+        self.elongation_cycles_remaining[games] = 0
+        self.elongation_factors[games] = self.initial_elongation_factor
+        self.red_apples[games] = -1
+        self.apple_tiles[games] = -1
+        self.other_apple_spawn_rates[games] = OTHER_APPLE_SPAWN_RATE
+        self.other_apple_despawn_rates[games] = OTHER_APPLE_DESPAWN_RATE
+        self.scores[games] = 0
+        self.levels[games] = 1
+        self.steps[games] = 0
+        self.dones[games] = False
+        self.wins[games] = False
+        self.heads[games] = self._random_free_tiles(games)
+        self.occupancy[games, self.heads[games]] = 1
+        self.red_apples[games] = self._random_free_tiles(games)
+
+    def step(self, actions):
+        actions = np.asarray(actions)
+        rewards = np.zeros(self.number_of_games)
+        self._turn(actions)
+        games = np.flatnonzero(~self.dones & (self.directions != NO_TURN))
+        self.steps[games] += 1
+        heads = self._move(games)
+        hit = (self.occupancy[games, heads] > 1) | self.walls[heads]
+        self.dones[games[hit]] = True
+        rewards[games[hit]] = DEATH_REWARD
+        games, heads = games[~hit], heads[~hit]
+        self._eat_apples(games, heads, rewards)
+        self._level_up(rewards)
+        self._apple_spawn_events()
+        return rewards, self.dones.copy()
+
+    def observe(self):
+        boards = np.where(self.walls, WALL_TILE, EMPTY_TILE).astype(np.int8)
+        boards = np.repeat(boards[None, :], self.number_of_games, axis=0)
+        boards[self.occupancy > 0] = BODY_TILE
+        games = np.arange(self.number_of_games)
+        boards[games, self.heads] = HEAD_TILE
+        placed = self.red_apples >= 0
+        boards[games[placed], self.red_apples[placed]] = RED_APPLE_TILE
+        games, slots = np.nonzero(self.apple_tiles >= 0)
+        boards[games, self.apple_tiles[games, slots]] = self.apple_kinds[games, slots]
+        return boards.reshape(self.number_of_games, self.rows, self.columns)
+
+    def _build_walls(self):
+        brick_wall = BrickWall((self.columns * TILE_WIDTH_PIXELS, self.rows * TILE_WIDTH_PIXELS), BLACK)
+        return np.frombuffer(brick_wall.mask, np.uint8).astype(bool)
+
+    def _turn(self, actions):
+        is_horizontal = (self.directions == RIGHT) | (self.directions == LEFT)
+        is_vertical = (self.directions == UP) | (self.directions == DOWN)
+        wants_horizontal = (actions == RIGHT) | (actions == LEFT)
+        wants_vertical = (actions == UP) | (actions == DOWN)
+        turning = ~self.dones & ((wants_horizontal & ~is_horizontal) | (wants_vertical & ~is_vertical))
+        self.directions[turning] = actions[turning]
+
+    def _move(self, games):
+        """Move the given games' snakes one tile along and return their new head tiles."""
+        capacity = self.bodies.shape[1]
+        old_heads = self.heads[games]
+        directions = self.directions[games]
+        columns = (old_heads % self.columns + COLUMN_STEPS[directions]) % self.columns
+        rows = (old_heads // self.columns + ROW_STEPS[directions]) % self.rows
+        heads = rows * self.columns + columns
+
+        # the old head becomes the front of the body, and the tail goes unless the snake is growing
+        fronts = (self.body_fronts[games] - 1) % capacity
+        self.body_fronts[games] = fronts
+        self.bodies[games, fronts] = old_heads
+        self.body_lengths[games] += 1
+        is_growing = self.elongation_cycles_remaining[games] > 0
+        self.elongation_cycles_remaining[games[is_growing]] -= TICKS_PER_MOVE
+        np.maximum(self.elongation_cycles_remaining, 0, out=self.elongation_cycles_remaining)
+        shrinking = games[~is_growing]
+        self.body_lengths[shrinking] -= 1
+        tails = self.bodies[shrinking, (self.body_fronts[shrinking] + self.body_lengths[shrinking]) % capacity]
+        self.occupancy[shrinking, tails] -= 1
+
+        self.occupancy[games, heads] += 1
+        self.heads[games] = heads
+        return heads
+
+    def _eat_apples(self, games, heads, rewards):
+        ate_red = heads == self.red_apples[games]
+        eaters = games[ate_red]
+        self.elongation_cycles_remaining[eaters] += self.elongation_factors[eaters]
+        self.scores[eaters] += 1
+        rewards[eaters] += APPLE_REWARD
+        self.red_apples[eaters] = -1
+        self.red_apples[eaters] = self._random_free_tiles(eaters)
+
+        matches = self.apple_tiles[games] == heads[:, None]
+        ate_other = matches.any(axis=1)
+        eaters = games[ate_other]
+        slots = matches[ate_other].argmax(axis=1)
+        kinds = self.apple_kinds[eaters, slots]
+        self.apple_tiles[eaters, slots] = -1
+        self.scores[eaters] += 1
+        rewards[eaters] += APPLE_REWARD
+        poisoned = eaters[kinds == POISON_APPLE]
+        self.elongation_cycles_remaining[poisoned] += self.elongation_factors[poisoned] * POISON_ELONGATION_MULTIPLIER
+        for game in eaters[kinds == GOLDEN_APPLE]:
+            self._remove_half(game)
+
+    def _remove_half(self, game):
+        """Cut the snake in half, or down to just its head if it is no longer than one red apple's growth."""
+        length = self.body_lengths[game]
+        if length * TICKS_PER_MOVE <= self.elongation_factors[game]:
+            removed = length
+        else:
+            removed = length - length // 2
+        capacity = self.bodies.shape[1]
+        indices = (self.body_fronts[game] + np.arange(length - removed, length)) % capacity
+        self.occupancy[game, self.bodies[game, indices]] -= 1
+        self.body_lengths[game] -= removed
+        self.elongation_cycles_remaining[game] = 0
+
+    def _level_up(self, rewards):
+        leveling = np.flatnonzero(~self.dones & (self.scores >= POINTS_PER_LEVEL))
+        won = leveling[self.levels[leveling] == FINAL_LEVEL]
+        self.wins[won] = True
+        self.dones[won] = True
+        rewards[won] += WIN_REWARD
+        games = leveling[self.levels[leveling] != FINAL_LEVEL]
+        self.levels[games] += 1
+        self.scores[games] = 0
+        self.occupancy[games] = 0
+        self.occupancy[games, self.heads[games]] = 1
+        self.body_lengths[games] = 0
+        self.elongation_cycles_remaining[games] = 0
+        self.elongation_factors[games] += self.initial_elongation_factor
+        self.apple_tiles[games] = -1
+        self.other_apple_spawn_rates[games] *= APPLE_RATE_INCREASE_PER_LEVEL
+        self.other_apple_despawn_rates[games] *= APPLE_RATE_INCREASE_PER_LEVEL
+
+    def _apple_spawn_events(self):
+        live = np.flatnonzero(~self.dones)
+        unplaced = live[self.red_apples[live] < 0]
+        self.red_apples[unplaced] = self._random_free_tiles(unplaced)
+
+        spawn_chances = 1 - (1 - self.other_apple_spawn_rates[live]) ** TICKS_PER_MOVE
+        spawning = live[self.random.random(live.size) < spawn_chances]
+        if not (self.apple_tiles[spawning] < 0).any(axis=1).all():
+            self._grow_apple_slots()
+        slots = (self.apple_tiles[spawning] < 0).argmax(axis=1)
+        is_golden = self.random.random(spawning.size) < GOLDEN_APPLE_CHANCE
+        self.apple_kinds[spawning, slots] = np.where(is_golden, GOLDEN_APPLE, POISON_APPLE)
+        self.apple_tiles[spawning, slots] = self._random_free_tiles(spawning)
+
+        despawn_chances = 1 - (1 - self.other_apple_despawn_rates[live]) ** TICKS_PER_MOVE
+        despawning = live[self.random.random(live.size) < despawn_chances]
+        is_filled = self.apple_tiles[despawning] >= 0
+        has_apples = is_filled.any(axis=1)
+        despawning, is_filled = despawning[has_apples], is_filled[has_apples]
+        slots = np.where(is_filled, self.random.random(is_filled.shape), -1).argmax(axis=1)
+        self.apple_tiles[despawning, slots] = -1
+
+    def _grow_apple_slots(self):
+        self.apple_tiles = np.concatenate((self.apple_tiles, np.full_like(self.apple_tiles, -1)), axis=1)
+        self.apple_kinds = np.concatenate((self.apple_kinds, np.zeros_like(self.apple_kinds)), axis=1)
+
+    def _random_free_tiles(self, games):
+        """Pick a random free tile in each of the given games, or -1 for a game with no room left."""
+        tiles = np.full(games.size, -1, np.int64)
+        pending = np.arange(games.size)
+        for _ in range(PLACEMENT_ATTEMPTS):
+            if not pending.size:
+                return tiles
+            candidates = self.random.integers(0, self.walls.size, pending.size)
+            is_free = self._are_free(games[pending], candidates)
+            tiles[pending[is_free]] = candidates[is_free]
+            pending = pending[~is_free]
+        # crowded grids rarely turn up a free tile by chance, so choose from the free ones directly
+        for index in pending:
+            game = games[index]
+            free = np.flatnonzero(self._are_free(np.full(self.walls.size, game), np.arange(self.walls.size)))
+            if free.size:
+                tiles[index] = self.random.choice(free)
+        return tiles
+
+    def _are_free(self, games, tiles):
+        return ((self.occupancy[games, tiles] == 0) & ~self.walls[tiles]
+                & (self.red_apples[games] != tiles) & ~(self.apple_tiles[games] == tiles[:, None]).any(axis=1))
@@ -0,0 +1,93 @@
+"""
+Per-tick cost of Grid.check_snake_collision as the snake grows.
+
+Lays a snake of each length, in tiles, out in a serpentine across a large grid, then times the collision check
+against a linear scan over every body tile and brick, which is how collisions used to be found.
+
+    python benchmarks/bench_collision.py
+"""
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from config import *
+from grid import Grid
+from snake import Snake
+from tiles import FreeTileIndex
+
+SNAKE_LENGTHS = (10, 100, 1000, 10000)
+GRID_TILES = 150
+CALLS_PER_MEASUREMENT = 2000
+
+
+def build_grid(snake_length, columns=GRID_TILES, rows=GRID_TILES):
+    """
+    Return a grid whose snake has grown to snake_length tiles without running into anything,
+    or None if a snake that long doesn't fit on a grid of this size.
+    """
+    dimensions = (columns * TILE_WIDTH_PIXELS, rows * TILE_WIDTH_PIXELS)
+    grid = Grid(dimensions, GREEN_PALETTE, Snake(BLUE_SPECTRUM, 1), random.Random(0))
+    snake = grid.snake
+    # keep clear of the wall, sweeping right and left across the rows in between
+    snake.head.move_to(4 * TILE_WIDTH_PIXELS, 4 * TILE_WIDTH_PIXELS)
+    snake.head.command_pending = K_RIGHT
+    snake.elongation_cycles_remaining = (snake_length - 1) * TICKS_PER_MOVE
+    first_column, last_column = 4, columns - 5
+    heading = K_RIGHT
+    while len(snake) < snake_length:
+        head = snake.head
+        column, row = head.x // TILE_WIDTH_PIXELS, head.y // TILE_WIDTH_PIXELS
+        if row > rows - 5:
+            return None
+        if head.moveX and column in (first_column, last_column):
+            snake.head.command_pending = K_DOWN
+        elif head.moveY:
+            heading = K_LEFT if heading == K_RIGHT else K_RIGHT
+            snake.head.command_pending = heading
+        while not snake.update():
+            pass
+    _reindex_free_tiles(grid)
+    return grid
+
+
+def _reindex_free_tiles(grid):
+    """Cover the tiles of the snake's final position, since it was moved without going through the grid."""
+    grid.free_tiles = FreeTileIndex(grid.columns, grid.rows, grid.random)
+    for x, y, size in grid.brick_wall.blocks():
+        grid.free_tiles.occupy(x, y, size)
+    for x, y in grid.snake.positions():
+        grid.free_tiles.occupy(x, y, TILE_WIDTH_PIXELS)
+    grid.free_tiles.occupy(grid.red_apple.x, grid.red_apple.y, grid.red_apple.size)
+
+
+def linear_scan(grid):
+    head = grid.snake.head
+    for index, (x, y) in enumerate(grid.snake.positions()):
+        if index and _overlaps(head.x, head.y, TILE_WIDTH_PIXELS, x, y, TILE_WIDTH_PIXELS):
+            return True
+    for brick in grid.brick_wall.bricks:
+        if _overlaps(head.x, head.y, TILE_WIDTH_PIXELS, brick.x, brick.y, brick.size):
+            return True
+    return False
+
+
+def _overlaps(x, y, size, other_x, other_y, other_size):
+    return other_x < x + size and x < other_x + other_size and other_y < y + size and y < other_y + other_size
+
+
+def main():
+    print(f"{'tiles':>8} {'occupancy (us)':>16} {'linear scan (us)':>18}")
+    for snake_length in SNAKE_LENGTHS:
+        grid = build_grid(snake_length)
+        assert not grid.check_snake_collision() and not linear_scan(grid)
+        occupancy = timeit.timeit(grid.check_snake_collision, number=CALLS_PER_MEASUREMENT)
+        scan = timeit.timeit(lambda: linear_scan(grid), number=CALLS_PER_MEASUREMENT)
+        print(f"{snake_length:>8} {occupancy / CALLS_PER_MEASUREMENT * 1e6:>16.3f} "
+              f"{scan / CALLS_PER_MEASUREMENT * 1e6:>18.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+"""
+How much CPU the start menu and the directions use while they sit waiting for the player, and how long a
+key press takes to show on the screen.
+
+Each run starts the game in a fresh process, with keys pressed from another thread. For each screen,
+the game is left alone on it for a while and the CPU time the process used over that stretch is
+reported as a share of one core. Then keys are pressed on the start menu, and the time from each press
+to the next flip of the screen is reported.
+
+    python benchmarks/bench_menu_idle.py
+    python benchmarks/bench_menu_idle.py --seconds 5 --presses 50
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+DEFAULT_SECONDS = 3
+DEFAULT_PRESSES = 20
+PRESS_INTERVAL = 0.05
+SETTLE_SECONDS = 1  # longer than the pause after the settings are locked in
+
+
+def _start_game():
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import pygame
+    import main
+    pygame.init()
+    return pygame, main.Game()
+
+
+def _press(pygame, key):
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode="", scancode=0))
+
+
+def _play_until_escape(game):
+    try:
+        game.play()
+    except SystemExit:
+        pass
+
+
+def _idle_cpu(keys, seconds):
+    """Press keys to get to a screen, leave the game idle on it, and return its share of a core used."""
+    pygame, game = _start_game()
+    samples = []
+
+    def press():
+        for key in keys:
+            time.sleep(PRESS_INTERVAL)
+            _press(pygame, key)
+        time.sleep(SETTLE_SECONDS)
+        samples.append((time.perf_counter(), time.process_time()))
+        time.sleep(seconds)
+        samples.append((time.perf_counter(), time.process_time()))
+        _press(pygame, pygame.K_ESCAPE)
+    threading.Thread(target=press, daemon=True).start()
+    _play_until_escape(game)
+    (wall_start, cpu_start), (wall_end, cpu_end) = samples
+    return (cpu_end - cpu_start) / (wall_end - wall_start) * 100
+
+
+def menu_idle(seconds):
+    return {"menu_idle_cpu_percent": _idle_cpu([], seconds)}
+
+
+def directions_idle(seconds):
+    import pygame
+    keys = [pygame.K_DOWN, pygame.K_DOWN, pygame.K_DOWN, pygame.K_RETURN]
+    return {"directions_idle_cpu_percent": _idle_cpu(keys, seconds)}
+
+
+def menu_latency(presses):
+    pygame, game = _start_game()
+    pressed_at, latencies = [], []
+    flip = pygame.display.flip
+
+    def timed_flip(*args):
+        flip(*args)
+        if len(latencies) < len(pressed_at):
+            latencies.append((time.perf_counter() - pressed_at[len(latencies)]) * 1000)
+    pygame.display.flip = timed_flip
+    pygame.display.update = timed_flip
+
+    def press():
+        for _ in range(int(presses)):
+            time.sleep(PRESS_INTERVAL)
+            pressed_at.append(time.perf_counter())
+            _press(pygame, pygame.K_DOWN)
+        time.sleep(PRESS_INTERVAL)
+        _press(pygame, pygame.K_ESCAPE)
+    threading.Thread(target=press, daemon=True).start()
+    _play_until_escape(game)
+    latencies = sorted(latencies)
+    return {
+        "menu_key_to_flip_median_ms": latencies[len(latencies) // 2],
+        "menu_key_to_flip_max_ms": latencies[-1],
+    }
+
+
+CHILDREN = {"menu": menu_idle, "directions": directions_idle, "latency": menu_latency}
+
+
+def _run_child(*args):
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), "--child"] + [str(arg) for arg in args],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time how much CPU the idle menus use and how fast they answer.")
+    parser.add_argument("--seconds", type=float, default=DEFAULT_SECONDS, help="how long each screen is left idle")
+    parser.add_argument("--presses", type=int, default=DEFAULT_PRESSES, help="how many key presses to time")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        name, value = args.child
+        print(json.dumps(CHILDREN[name](float(value))))
+        return
+
+    results = {}
+    results.update(_run_child("menu", args.seconds))
+    results.update(_run_child("directions", args.seconds))
+    results.update(_run_child("latency", args.presses))
+    for name, value in results.items():
+        print("{:<32} {:>8.2f}".format(name, value))
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""
+How long the game takes from launch to showing its first frame.
+
+Each run starts the game in a fresh process and times three stretches of its start up: importing the
+game's modules, setting up pygame and the Game, and playing until the start menu's first frame is
+flipped to the screen, which is the first frame the player can act on. Asset files still being read
+in the background at that point are timed separately. Then the time to the first frame of another game on the
+same settings is timed twice: once going back through the same Game's start menu, as playing again
+does, and once from a brand new Game.
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 20 --output startup.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+START = time.perf_counter()
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+DEFAULT_RUNS = 10
+PHASES = ("import", "init", "first_flip", "background_assets", "warm_restart", "cold_restart")
+
+
+class _FirstFlip(Exception):
+    """Raised from the first flip of the screen to stop the game there."""
+
+
+def _play_until_flip(scene):
+    try:
+        while True:
+            scene = scene.update(1000 / scene.game.clock_speed)
+            scene.draw(scene.game.screen)
+    except _FirstFlip:
+        pass
+
+
+def time_startup():
+    """Start the game in this process and return how long each phase of start up took, in milliseconds."""
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import main
+    import pygame
+    from assets import assets
+    from scenes import PlayingScene
+    imported = time.perf_counter()
+
+    def first_flip(*args):
+        raise _FirstFlip()
+    pygame.display.flip = first_flip
+    pygame.display.update = first_flip
+
+    pygame.init()
+    game = main.Game()
+    initialized = time.perf_counter()
+    try:
+        game.play()
+    except _FirstFlip:
+        pass
+    flipped = time.perf_counter()
+    assets.wait_for_preload()
+    preloaded = time.perf_counter()
+
+    for key in (pygame.K_DOWN, pygame.K_DOWN, pygame.K_DOWN, pygame.K_RETURN):
+        game.start_menu.handle_keypress(key)
+    settings = game.start_menu.chosen_settings()
+    game.start_game(settings)
+    game.show_grid()
+    restart_start = time.perf_counter()
+    game.reset()
+    # the menu keeps the last settings, still on GO, so pressing enter picks them again
+    game.start_menu.handle_keypress(pygame.K_RETURN)
+    game.start_game(game.start_menu.chosen_settings())
+    game.show_grid()
+    _play_until_flip(PlayingScene(game))
+    warm_restarted = time.perf_counter()
+    cold_game = main.Game()
+    cold_game.start_game(settings)
+    cold_game.show_grid()
+    _play_until_flip(PlayingScene(cold_game))
+    cold_restarted = time.perf_counter()
+    return {
+        "import": (imported - START) * 1000,
+        "init": (initialized - imported) * 1000,
+        "first_flip": (flipped - START) * 1000,
+        "background_assets": (preloaded - flipped) * 1000,
+        "warm_restart": (warm_restarted - restart_start) * 1000,
+        "cold_restart": (cold_restarted - warm_restarted) * 1000,
+    }
+
+
+def run(runs):
+    """Time start up in runs fresh processes and return the timings of every run, by phase."""
+    timings = {phase: [] for phase in PHASES}
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, os.path.abspath(__file__), "--child"], check=True,
+                                capture_output=True, text=True).stdout
+        run_timings = json.loads(output.splitlines()[-1])
+        for phase in PHASES:
+            timings[phase].append(run_timings[phase])
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the game's start up, from launch to its first frame.")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="how many times to start the game")
+    parser.add_argument("--output", help="write the timings of every run to this JSON file")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        print(json.dumps(time_startup()))
+        return
+
+    timings = run(args.runs)
+    print("{:<20} {:>12} {:>12}".format("phase (ms)", "median", "max"))
+    for phase in PHASES:
+        times = sorted(timings[phase])
+        print("{:<20} {:>12.1f} {:>12.1f}".format(phase, times[len(times) // 2], times[-1]))
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(timings, output_file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,226 @@
+"""
+Benchmarks for the hot paths of a game, plus a full game, compared against a stored baseline.
+
+Each micro benchmark times one function on grids of every preset size (and one large grid) with snakes
+of 10 to 10,000 tiles; snakes too long for a grid are skipped. The macro benchmark replays a scripted
+game and draws every tick of it. Results are written as JSON, keyed by benchmark, grid and snake length,
+and any median more than --tolerance times slower than the baseline is reported as a regression.
+
+    python benchmarks/bench_suite.py                    compare against benchmarks/baseline.json
+    python benchmarks/bench_suite.py --save-baseline    store this run as the new baseline
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from apple import Apple
+from bench_collision import build_grid
+from config import *
+from renderer import TileRenderer, create_renderer
+from replay import ReplayRecorder
+from simulation import Simulation, elongation_factor
+from statsbanner import StatsBanner
+from tournament import chase_apple
+
+SNAKE_LENGTHS = (10, 100, 1000, 10000)
+LARGE_GRID = (150, 150)
+CALLS_PER_MEASUREMENT = 1000
+QUICK_CALLS_PER_MEASUREMENT = 100
+ROUNDS = 5
+MACRO_SEED = 7
+MACRO_GRID = GRID_SIZE_PRESETS[0]
+MACRO_ELONGATION_FACTOR = elongation_factor(MACRO_GRID, DIFFICULTY_PRESETS[0][2])
+MACRO_TICKS = 3000
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_TOLERANCE = 1.5
+
+
+def measure(function, calls, before=None):
+    """
+    Time calls calls to function, running before untimed ahead of each one.
+
+    The calls are split into rounds and the round with the lowest median is kept, so a burst of
+    activity elsewhere on the machine doesn't read as a regression. Like timeit, garbage collection is
+    held off while timing.
+    """
+    gc.collect()
+    gc.disable()
+    try:
+        return _measure_rounds(function, calls, before)
+    finally:
+        gc.enable()
+
+
+def _measure_rounds(function, calls, before):
+    best = None
+    for _ in range(ROUNDS):
+        times = []
+        for _ in range(max(1, calls // ROUNDS)):
+            if before:
+                before()
+            start = time.perf_counter_ns()
+            function()
+            times.append(time.perf_counter_ns() - start)
+        timings = summarize(times)
+        if best is None or timings["median_us"] < best["median_us"]:
+            best = timings
+    return best
+
+
+def summarize(times):
+    times = sorted(times)
+    return {
+        "median_us": times[len(times) // 2] / 1000,
+        "p99_us": times[len(times) * 99 // 100] / 1000,
+        "calls": len(times),
+    }
+
+
+def micro_benchmarks(grid, calls):
+    """Yield the name and timings of each micro benchmark on a grid."""
+    apple = Apple(POISON)
+    yield "randomly_place_sprite", measure(lambda: grid.randomly_place_sprite(apple), calls,
+                                           before=lambda: _lift(grid, apple))
+    _lift(grid, apple)
+
+    yield "check_snake_collision", measure(grid.check_snake_collision, calls)
+    yield "check_apple_eaten", measure(grid.check_apple_eaten, calls)
+
+    renderer = create_renderer(grid)
+    screen = pygame.display.set_mode((renderer.rect.width, renderer.rect.bottom))
+    renderer.draw(screen)
+    yield "draw_everything", measure(lambda: renderer.draw(screen), calls, before=renderer.invalidate)
+    tile_renderer = create_renderer(grid, tile_rendering=True)
+    if isinstance(tile_renderer, TileRenderer):
+        tile_renderer.draw(screen)
+        yield "draw_tiles", measure(lambda: tile_renderer.draw(screen), calls)
+    renderer.draw(screen)
+    # the benchmarks from here on move the snake
+    yield "draw_changes", measure(lambda: renderer.draw(screen), calls, before=grid.update)
+    yield "snake_update", measure(grid.snake.update, calls)
+
+
+def _lift(grid, apple):
+    """Take an apple placed by the randomly_place_sprite benchmark back off the grid."""
+    if apple.is_placed or (apple.x, apple.y) != (0, 0):
+        grid.free_tiles.vacate(apple.x, apple.y, apple.size)
+        apple.move_to(0, 0)
+        apple.is_placed = False
+
+
+def macro_benchmark(ticks):
+    """Play a scripted game for up to ticks ticks, drawing every tick, and time each tick."""
+    # the script is what chase_apple pressed in a seeded game, recorded before any timing starts
+    simulation = Simulation(MACRO_GRID, BLUE_SPECTRUM, MACRO_ELONGATION_FACTOR, MACRO_SEED)
+    recorder = ReplayRecorder(simulation, BLUE_SPECTRUM)
+    while not simulation.is_over and simulation.ticks < ticks:
+        command = chase_apple(simulation)
+        if command is not None:
+            recorder.record(command)
+        simulation.step(command)
+    script = {tick: ARROW_KEYS[key] for tick, key in recorder.commands}
+    played_ticks = simulation.ticks
+
+    simulation = Simulation(MACRO_GRID, BLUE_SPECTRUM, MACRO_ELONGATION_FACTOR, MACRO_SEED)
+    grid = simulation.grid
+    renderer = create_renderer(grid)
+    screen = pygame.display.set_mode((renderer.rect.width, renderer.rect.bottom))
+    renderer.prepare_palettes(simulation.color_palettes + (GREY_PALETTE,))
+    banner = StatsBanner(grid.dimensions, GREEN_PALETTE[2])
+    times = []
+    start = time.perf_counter()
+    for tick in range(played_ticks):
+        tick_start = time.perf_counter_ns()
+        simulation.step(script.get(tick))
+        banner.score, banner.level = simulation.score, simulation.level
+        banner.update()
+        dirty_rects = renderer.draw(screen) + banner.draw(screen)
+        pygame.display.update(dirty_rects)
+        times.append(time.perf_counter_ns() - tick_start)
+    elapsed = time.perf_counter() - start
+    result = summarize(times)
+    result["ticks_per_second"] = played_ticks / elapsed
+    result["final_state_hash"] = simulation.state_hash()
+    return result
+
+
+def run(calls, macro_ticks):
+    results = {}
+    for columns, rows in GRID_SIZE_PRESETS + (LARGE_GRID,):
+        for snake_length in SNAKE_LENGTHS:
+            grid = build_grid(snake_length, columns, rows)
+            if grid is None:
+                continue
+            for name, timings in micro_benchmarks(grid, calls):
+                key = "{}/{}x{}/{}".format(name, columns, rows, snake_length)
+                results[key] = timings
+                print("{:<42} median {:>10.2f}us   p99 {:>10.2f}us".format(key, timings["median_us"],
+                                                                            timings["p99_us"]))
+    results["full_game"] = macro_benchmark(macro_ticks)
+    print("{:<42} median {:>10.2f}us   p99 {:>10.2f}us   {:,.0f} ticks/s".format(
+        "full_game", results["full_game"]["median_us"], results["full_game"]["p99_us"],
+        results["full_game"]["ticks_per_second"]))
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Print how each benchmark compares to the baseline and return the names of those that regressed."""
+    regressions = []
+    for key, timings in results.items():
+        if key not in baseline:
+            continue
+        ratio = timings["median_us"] / max(baseline[key]["median_us"], 1e-9)
+        if ratio > tolerance:
+            regressions.append(key)
+            print("REGRESSION {:<42} {:>10.2f}us -> {:>10.2f}us  ({:.2f}x)".format(
+                key, baseline[key]["median_us"], timings["median_us"], ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the game's hot paths against a stored baseline.")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="results to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="how many times slower than the baseline a median may be")
+    parser.add_argument("--quick", action="store_true", help="time fewer calls, for a rough check")
+    args = parser.parse_args()
+
+    pygame.init()
+    calls = QUICK_CALLS_PER_MEASUREMENT if args.quick else CALLS_PER_MEASUREMENT
+    report = {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "machine": platform.machine(),
+        "calls_per_measurement": calls,
+        "results": run(calls, MACRO_TICKS),
+    }
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2, sort_keys=True)
+    if args.save_baseline:
+        with open(args.baseline, "w") as baseline_file:
+            json.dump(report, baseline_file, indent=2, sort_keys=True)
+        return 0
+    if not os.path.exists(args.baseline):
+        print("no baseline at {}, run with --save-baseline to store one".format(args.baseline))
+        return 0
+    with open(args.baseline) as baseline_file:
+        baseline = json.load(baseline_file)["results"]
+    regressions = compare(report["results"], baseline, args.tolerance)
+    print("{} of {} benchmarks regressed".format(len(regressions), len(report["results"])))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -8,10 +8,46 @@ COLUMNS_IN_GRID = 36
 GRID_DIMENSIONS = (COLUMNS_IN_GRID * TILE_WIDTH_PIXELS, ROWS_IN_GRID * TILE_WIDTH_PIXELS)
 BANNER_DIMENSIONS = (GRID_DIMENSIONS[0], 100)
 DEFAULT_WINDOW_DIMENSIONS = (GRID_DIMENSIONS[0], GRID_DIMENSIONS[1] + BANNER_DIMENSIONS[1])
-PIXELS_TRAVERSED_PER_UPDATE = TILE_WIDTH_PIXELS / 3
+PIXELS_TRAVERSED_PER_UPDATE = TILE_WIDTH_PIXELS // 3
+TICKS_PER_MOVE = TILE_WIDTH_PIXELS // PIXELS_TRAVERSED_PER_UPDATE  # updates it takes the snake to move a tile
+MAX_WINDOW_TILES = (90, 56)  # grids any bigger are shown through a viewport that follows the snake
+VIEWPORT_TILES = (56, 44)
+VIEWPORT_CHUNK_TILES = 16
+BOARD_PIXEL_SIZE = PIXELS_TRAVERSED_PER_UPDATE  # in tile rendering, each step of the snake is one pixel of the board
+
+# FRAME TIMING #
+MAX_FRAME_RATE = 120
+MAX_TICKS_PER_FRAME = 5  # past this many updates per frame, the game slows down rather than skip more frames
+MENU_REFRESH_MS = 1000  # how often a screen waiting on the player is shown again, should the window have lost it
+SUBMIT_PAUSE_MS = 500  # the chime after the settings are locked in plays out before the directions are shown
+LOSS_PAUSE_MS = 3500  # how long the grid is left as the snake died on it before the offer to play again
+VICTORY_PAUSE_MS = 3000  # keys pressed this soon after winning don't end the game
+
+# PROFILER #
+PROFILER_CAPACITY = 3600  # frames kept
+PROFILER_OVERLAY_REFRESH_FRAMES = 30
+PROFILER_ENVIRONMENT_VARIABLE = "SNAKE_PROFILE"
+DEFAULT_PROFILE_PATH = "profile.csv"
+
+# SNAKE #
+INITIAL_BODY_CAPACITY = 64
+SNAKE_PALETTE_SIZE = 256  # black, then random hues of the snake's color for the body to be drawn in
+
+# APPLES #
+OTHER_APPLE_SPAWN_RATE = 0.0050
+OTHER_APPLE_DESPAWN_RATE = 0.0025
+GOLDEN_APPLE_CHANCE = 0.1
+POISON_ELONGATION_MULTIPLIER = 5
+APPLE_RATE_INCREASE_PER_LEVEL = 1.05
+
+# WALL MAPS #
+MAP_PATH = "maps/"
+WALL_MAP_WALL = "#"
+WALL_MAP_OPEN = "."
 
 # SCORE #
 POINTS_PER_LEVEL = 10
+FINAL_LEVEL = 10
 
 # COLORS #
 BLACK = (0, 0, 0)
@@ -31,30 +67,43 @@ BROWN_PALETTE = ((125, 112, 96), (107, 68, 49), (74, 47, 21))
 PURPLE_PALETTE = ((195, 165, 230), (130, 90, 195), (85, 25, 165))
 RED_PALETTE = ((221, 176, 178), (173, 68, 73), (115, 13, 17))
 
-def BLUE_SPECTRUM():
+def BLUE_SPECTRUM(rng=random):
     r = 0
-    g = random.randrange(65, 200)
-    b = random.randrange(220, 245)
+    g = rng.randrange(65, 200)
+    b = rng.randrange(220, 245)
     return (r, g, b)
 
-def GREEN_SPECTRUM():
-    r = random.randrange(0, 15)
-    g = random.randrange(95, 210)
-    b = random.randrange(0, 35)
+def GREEN_SPECTRUM(rng=random):
+    r = rng.randrange(0, 15)
+    g = rng.randrange(95, 210)
+    b = rng.randrange(0, 35)
     return (r, g, b)
 
-def PURPLE_SPECTRUM():
-    r = random.randrange(80, 210)
-    g = random.randrange(0, 50)
-    b = random.randrange(200, 240)
+def PURPLE_SPECTRUM(rng=random):
+    r = rng.randrange(80, 210)
+    g = rng.randrange(0, 50)
+    b = rng.randrange(200, 240)
     return (r, g, b)
 
-def YARN_COLOR():
-    r = random.randrange(0, 256)
-    g = random.randrange(0, 256)
-    b = random.randrange(0, 256)
+def YARN_COLOR(rng=random):
+    r = rng.randrange(0, 256)
+    g = rng.randrange(0, 256)
+    b = rng.randrange(0, 256)
     return (r, g, b)
 
+SNAKE_COLORS = (BLUE_SPECTRUM, GREEN_SPECTRUM, PURPLE_SPECTRUM)
+
+# SETTINGS #
+                     # name, game speed, snake elongation rate
+DIFFICULTY_PRESETS = (("Normal", 40, 6),
+                      ("Hard", 44, 8),
+                      ("Brutal", 50, 12),
+                      ("Easy", 38, 4))
+# grid size lengths must be an even integer
+GRID_SIZE_PRESETS = ((38, 38), (56, 56), (90, 44), (36, 56), (26, 26), (500, 500))
+GRID_GRAPHIC_MAX_PIXELS = 180
+ELONGATION_REFERENCE_GRID = (38, 38)  # elongation rates are snake growth per apple on a grid of this size
+
 # FONTS #
 FONT_PATH = "fonts/"
 STANDARD_FONT = "rajdhani.ttf"
@@ -64,6 +113,18 @@ FONT_SIZE_MEDIUM = int(TILE_WIDTH_PIXELS * 2.4)
 FONT_SIZE_LARGE = int(TILE_WIDTH_PIXELS * 3)
 FONT_SIZE_HUGE = int(TILE_WIDTH_PIXELS * 5.5)
 FONT_SIZE_GIANT = int(TILE_WIDTH_PIXELS * 8)
+TEXT_CACHE_BYTES = 8 * 1024 * 1024
+PRELOADED_FONT_SIZES = (FONT_SIZE_XSMALL, FONT_SIZE_SMALL, FONT_SIZE_MEDIUM, FONT_SIZE_LARGE, FONT_SIZE_HUGE)
+
+# IMAGES #
+IMAGE_PATH = "images/"
+ARROW_KEYS_IMAGE = "arrow_keys_small.png"
+WASD_KEYS_IMAGE = "wasd_keys_small.png"
+PRELOADED_IMAGES = (
+    (ARROW_KEYS_IMAGE, dict(scale=0.55, colorkey=True)),
+    (ARROW_KEYS_IMAGE, dict(scale=0.60, alpha=True, colorkey=True, smooth=True)),
+    (WASD_KEYS_IMAGE, dict(scale=0.50, alpha=True, smooth=True)),
+)
 
 # Keys #
 ARROW_KEYS = [K_a, K_w, K_d, K_s, K_LEFT, K_UP, K_RIGHT, K_DOWN]
@@ -90,6 +151,8 @@ LEVEL_ANNOUNCEMENT_SOUNDS = (
     "level_nine.wav",
     "level_last.wav",
 )
+PRELOADED_SOUNDS = (BEEP1_SOUND, BEEP2_SOUND, GLOSS_SOUND, CHIME_LOW_SOUND, CHIME_HIGH_SOUND, DING_SOUND,
+                    VICTORY_SOUND, LOSS_SOUND) + LEVEL_ANNOUNCEMENT_SOUNDS
 # Sound effects obtained from zapsplat.com
 # TTS files obtained from ibm.com/cloud/watson-text-to-speech
 
@@ -1,6 +1,6 @@
-import pygame
 from config import *
 from apple import Apple
+from tiles import AppleIndex, FreeTileIndex
 from wall import BrickWall
 
 
@@ -14,16 +14,22 @@ class Grid:
     ----------
     dimensions : tuple of int
         the dimensions of the playing grid in pixels
-    background : pygame.Surface
-        a rectangular graphic representing the grid
-    rect : pygame.Rect
-        coordinates of the grid
+    columns : int
+        the number of tiles across the grid
+    rows : int
+        the number of tiles down the grid
+    background_color : tuple of int
+        rgb color of the grid's background
+    random : random.Random
+        where the random placement and spawning of apples is drawn from
+    free_tiles : FreeTileIndex
+        the tiles not covered by the snake, an apple, or the wall
     snake : Snake
         the single snake in the game
     red_apple : Apple
         the single apple in the game
-    other_apples : list of Apple
-        a collection of golden and poison currently on the grid
+    other_apples : AppleIndex
+        the golden and poison apples currently on the grid, by the tile they're on
     other_apple_spawn_rate : float
         the rate at which golden and poison apples randomly spawn onto grid
     other_apple_despawn_rate : float
@@ -32,9 +38,10 @@ class Grid:
     Methods
     -------
     randomly_place_sprite(sprite_to_place)
-        randomly place sprite on grid where it will not overlap with the snake, any apples, or the wall
+        randomly place sprite on grid where it will not overlap with the snake, any apples, or the wall,
+        returns False if there is no room left on the grid
     check_apple_eaten()
-        handle events for when the snake runs into an apple
+        handle events for when the snake runs into an apple, returns the apple eaten if any
     check_snake_collision()
         handle events for when the snake runs into a wall or itself
     level_up()
@@ -43,112 +50,123 @@ class Grid:
         update the grid's snake and randomly spawn apples
     change_colors()
         change the colors of the grid's background and wall
-    draw()
-        draw the grid and it's snake and apples to the screen
     """
-    def __init__(self, dimensions, color_palette, snake):
+    def __init__(self, dimensions, color_palette, snake, rng=random, wall_map=None):
         self.dimensions = dimensions
-        self.background = pygame.Surface(dimensions).convert()
-        self.background.fill(color_palette[0])
-        self.rect = self.background.get_rect()
-        self.rect.topleft = 0, BANNER_DIMENSIONS[1]
-        self.brick_wall = BrickWall(self.dimensions, color_palette[1])
+        self.columns = int(dimensions[0] / TILE_WIDTH_PIXELS)
+        self.rows = int(dimensions[1] / TILE_WIDTH_PIXELS)
+        self.background_color = color_palette[0]
+        self.random = rng
+        self.brick_wall = BrickWall(self.dimensions, color_palette[1], wall_map)
+        self.free_tiles = FreeTileIndex(self.columns, self.rows, rng)
+        for x, y, size in self.brick_wall.blocks():
+            self.free_tiles.occupy(x, y, size)
         self.snake = snake
+        self.snake.set_grid_size(self.columns, self.rows)
         self.red_apple = Apple(RED)
-        self.other_apples = []
-        self.other_apple_spawn_rate = 0.0050
-        self.other_apple_despawn_rate = 0.0025
+        self.other_apples = AppleIndex(self.columns)
+        self.other_apple_spawn_rate = OTHER_APPLE_SPAWN_RATE
+        self.other_apple_despawn_rate = OTHER_APPLE_DESPAWN_RATE
         self.randomly_place_sprite(self.snake.head)
-        self.randomly_place_sprite(self.red_apple)
+        self._spare_apples = []
+        self._leaving_tail = None
+        self._place_apple(self.red_apple)
 
     def randomly_place_sprite(self, sprite_to_place):
-        while True:
-            rows_in_grid = int(self.dimensions[1] / TILE_WIDTH_PIXELS)
-            columns_in_grid = int(self.dimensions[0] / TILE_WIDTH_PIXELS)
-            x_pos = random.randint(0, columns_in_grid - 1) * TILE_WIDTH_PIXELS
-            y_pos = random.randint(0, rows_in_grid - 1) * TILE_WIDTH_PIXELS + BANNER_DIMENSIONS[1]
-            sprite_to_place.move_to(x_pos, y_pos)
-            all_sprites = (self.snake.all_pieces +
-                           self.other_apples +
-                           self.brick_wall.bricks)
-            all_other_sprites = [sprite for sprite in all_sprites if sprite is not sprite_to_place]
-            if sprite_to_place.rect.collidelist(all_other_sprites) == -1 and self.rect.contains(sprite_to_place.rect):
-                return
+        position = self.free_tiles.random_free_position()
+        if position is None:
+            return False
+        sprite_to_place.move_to(*position)
+        self.free_tiles.occupy(sprite_to_place.x, sprite_to_place.y, sprite_to_place.size)
+        return True
 
     def check_apple_eaten(self):
-        all_apples = self.other_apples + [self.red_apple]
-        collision_index = self.snake.head.rect.collidelist(all_apples)
-        if collision_index != -1:  # if collision
-            apple_obtained = all_apples[collision_index]
-            apple_obtained.eaten_sound.play()
-            if apple_obtained.color == RED:
-                self.randomly_place_sprite(self.red_apple)
-                self.snake.elongation_cycles_remaining += self.snake.elongation_factor
-            elif apple_obtained.color == GOLDEN:
-                self.snake.remove_half()
-                del self.other_apples[collision_index]
-            elif apple_obtained.color == POISON:
-                self.snake.elongation_cycles_remaining += self.snake.elongation_factor * 5
-                del self.other_apples[collision_index]
-            return True
-        return False
+        head = self.snake.head
+        red_apple = self.red_apple
+        if red_apple.is_placed and red_apple.x == head.x and red_apple.y == head.y:
+            self._remove_apple(red_apple)
+            self._place_apple(red_apple)
+            self.snake.elongation_cycles_remaining += self.snake.elongation_factor
+            return red_apple
+        apple_obtained = self.other_apples.at(head.x, head.y)
+        if apple_obtained is None:
+            return None
+        self._remove_other_apple(apple_obtained)
+        if apple_obtained.color == GOLDEN:
+            self._remove_snake_pieces(self.snake.remove_half())
+        elif apple_obtained.color == POISON:
+            self.snake.elongation_cycles_remaining += self.snake.elongation_factor * POISON_ELONGATION_MULTIPLIER
+        return apple_obtained
 
     def check_snake_collision(self):
-        # ignore first 5 pieces of snake body, they overlap with snake's head when turning
-        if self.snake.head.rect.collidelist(self.snake.body_pieces_only[5:]) != -1:
+        if self.snake.head_hits_body():
             return True
-        if self.snake.head.rect.collidelist(self.brick_wall.bricks) != -1:
+        if self.brick_wall.is_hit_at(self.snake.head.x, self.snake.head.y):
             return True
         return False
 
     def level_up(self):
-        self.snake.level_up()
-        self.other_apples = []
-        self.other_apple_spawn_rate *= 1.05
-        self.other_apple_despawn_rate *= 1.05
+        self._remove_snake_pieces(self.snake.level_up())
+        while self.other_apples:
+            self._remove_other_apple(self.other_apples.apples[-1])
+        self.other_apple_spawn_rate *= APPLE_RATE_INCREASE_PER_LEVEL
+        self.other_apple_despawn_rate *= APPLE_RATE_INCREASE_PER_LEVEL
 
     def update(self):
-        self.snake.update()
-        self._handle_snake_OOB()
+        # every piece steps into the spot the piece ahead of it just left, so the only spots the snake
+        # starts or stops covering are the head's new spot and, unless it is growing, the tail's old one
+        tail_x, tail_y = self.snake.position(len(self.snake) - 1)
+        is_growing = self.snake.elongation_cycles_remaining > 0
+        if self.snake.update():
+            head = self.snake.head
+            self.free_tiles.occupy(head.x, head.y, head.size)
+            if not is_growing:
+                # the tail is drawn sliding off its old spot until the snake is about to move again,
+                # so nothing is placed there until it is out of sight
+                self._leaving_tail = (tail_x, tail_y)
+        if self.snake.moves_on_next_update():
+            self._release_leaving_tail()
+        if not self.red_apple.is_placed:
+            self._place_apple(self.red_apple)
         self._apple_spawn_events()
 
     def change_color(self, background_color, wall_color):
-        self.background.fill(background_color)
+        self.background_color = background_color
         self.brick_wall.change_color(wall_color)
 
-    def draw(self, surface):
-        surface.blit(self.background, self.rect)
-        self.red_apple.draw(surface)
-        for apple in self.other_apples:
-            apple.draw(surface)
-        for piece in self.snake.all_pieces:
-            piece.draw(surface)
-        self.brick_wall.draw(surface)
-
-    def _handle_snake_OOB(self):
-        for piece in self.snake.all_pieces:
-            if piece.rect.right > self.rect.right:
-                piece.rect.move_ip(-self.dimensions[0], 0)
-                return
-            elif piece.rect.left < self.rect.left:
-                piece.rect.move_ip(+self.dimensions[0], 0)
-                return
-            elif piece.rect.top < self.rect.top:
-                piece.rect.move_ip(0, +self.dimensions[1])
-                return
-            elif piece.rect.bottom > self.rect.bottom:
-                piece.rect.move_ip(0, -self.dimensions[1])
-                return
-
     def _apple_spawn_events(self):
-        if random.random() < self.other_apple_spawn_rate:
-            if random.random() < 0.1:
-                self.other_apples.append(Apple(GOLDEN))
+        if self.random.random() < self.other_apple_spawn_rate:
+            # apples taken off the grid are reused, so spawning one doesn't allocate anything
+            new_apple = self._spare_apples.pop() if self._spare_apples else Apple(POISON)
+            new_apple.color = GOLDEN if self.random.random() < GOLDEN_APPLE_CHANCE else POISON
+            if self._place_apple(new_apple):
+                self.other_apples.add(new_apple)
             else:
-                self.other_apples.append(Apple(POISON))
-            self.randomly_place_sprite(self.other_apples[-1])
-        if random.random() < self.other_apple_despawn_rate and self.other_apples:
-            apple_to_delete = random.choice(self.other_apples)
-            self.other_apples.remove(apple_to_delete)
-
+                self._spare_apples.append(new_apple)
+        if self.random.random() < self.other_apple_despawn_rate and self.other_apples:
+            self._remove_other_apple(self.random.choice(self.other_apples.apples))
+
+    def _place_apple(self, apple):
+        apple.is_placed = self.randomly_place_sprite(apple)
+        return apple.is_placed
+
+    def _remove_apple(self, apple):
+        self.free_tiles.vacate(apple.x, apple.y, apple.size)
+        apple.is_placed = False
+
+    def _remove_other_apple(self, apple):
+        self.other_apples.remove(apple)
+        self._remove_apple(apple)
+        self._spare_apples.append(apple)
+
+    def _release_leaving_tail(self):
+        if self._leaving_tail is not None:
+            self.free_tiles.vacate(*self._leaving_tail, TILE_WIDTH_PIXELS)
+            self._leaving_tail = None
+
+    def _remove_snake_pieces(self, positions):
+        # the snake's new tail is drawn still, so the spot the old one was leaving is out of sight too
+        self._release_leaving_tail()
+        for x, y in positions:
+            self.free_tiles.vacate(x, y, TILE_WIDTH_PIXELS)
 
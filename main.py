@@ -1,12 +1,19 @@
+import argparse
+import os
 import sys
 import time
 import pygame
 
+from assets import assets
 from config import *
 from startmenu import StartMenu
-from grid import Grid
+from profiler import FrameProfiler
+from renderer import create_renderer
+from replay import ReplayRecorder
+from scenes import MenuScene
+from simulation import Simulation
 from statsbanner import StatsBanner
-from snake import Snake
+from wall import load_wall_map
 
 
 class Game:
@@ -15,6 +22,11 @@ class Game:
 
     Move the snake to collect apples, score points, and level up. 10 levels total.
 
+    Everything from the start menu to the end of the game runs under one loop, showing one scene at a
+    time: the start menu, the directions, the game being played, the change from one level to the next,
+    and the screens for losing and winning. Playing again goes back to the start menu in the same window,
+    keeping the menu and assets, and the renderer's layers too if the next grid is the same size as the last.
+
     ...
 
     Attributes
@@ -25,185 +37,195 @@ class Game:
         the surface on which all of the game's sprites are displayed
     start_menu : StartMenu
         the game's start menu
+    settings : tuple or None
+        the game speed, snake color, snake elongation factor, and grid dimensions chosen in the start menu
+    games_started : int
+        how many games have been started in the window, counting the one being played
     clock_speed : int
-        the game's frame rate
+        the number of times per second the game updates, regardless of how often it's drawn
+    dropped_frames : int
+        the number of updates that were skipped over when drawing, to keep up with the clock speed
+    simulation_lag : float
+        the total seconds by which the game has fallen behind the clock speed, because the machine couldn't
+        keep up even with frames being skipped
+    simulation : Simulation
+        the rules and state of the game being played
     stats_banner : StatsBanner
         displays the points and current level
     grid : Grid
         the board on which the game is played
-    color_palettes : tuple of tuple
-        tuples of rgb color values
+    tile_rendering : bool
+        whether grids that fit in the window are drawn at one pixel per step and scaled up
+    wall_map : WallMap or None
+        the layout of the wall to play on, which also sets the size of the grid, or None for the chosen
+        grid size with a wall around its edge
+    grid_renderer : GridRenderer, TileRenderer or ViewportRenderer
+        draws the grid to the screen, or the part of it around the snake if the grid is too big to fit
+    apple_sounds : dict
+        the sound played when an apple is eaten, keyed by the apple's color
+    replay_directory : str or None
+        where to save a recording of the game once it's over, if anywhere
+    recorder : ReplayRecorder
+        records the keys pressed during the game
+    scene : Scene or None
+        what's being shown, starting with the start menu, or None once the game is over
+    play_again : bool or None
+        whether the player wants to play another game, or None until they've said
+    profile_path : str or None
+        where to write the frame timings once each game is over, if the games are being profiled; each
+        game's timings go to their own file, named with the game's number before the extension
+    profiler : FrameProfiler or None
+        times each phase of every frame, if the game is being profiled
 
     Methods
     -------
     play()
-        the main loop of the game
+        the main loop of the game, returns whether the player wants to play again
+    start_game(settings)
+        set up a game with the settings chosen in the start menu
+    reset()
+        go back to the start menu to set up another game
+    show_grid()
+        resize the window to fit the grid and get it ready to be drawn
+    save_replay()
+        save a recording of the game, if recording
 
     """
 
-    def __init__(self):
+    def __init__(self, replay_directory=None, profile_path=None, tile_rendering=False, wall_map=None):
         pygame.display.set_caption("SNAKE by Qelery")
         pygame.mouse.set_visible(False)
         self.window_dimensions = DEFAULT_WINDOW_DIMENSIONS
         self.screen = pygame.display.set_mode(self.window_dimensions)
         self.start_menu = StartMenu(self.window_dimensions, self.screen)
+        # the rest of the assets are read while the player picks their settings
+        assets.preload_in_background()
+        self.settings = None
+        self.games_started = 0
         self.clock_speed = 0
+        self.dropped_frames = 0
+        self.simulation_lag = 0.0
+        self.simulation = None
         self.stats_banner = None
         self.grid = None
-        self.color_palettes = (
-            GREEN_PALETTE,
-            RED_PALETTE,
-            BLUE_PALETTE,
-            BROWN_PALETTE,
-            PURPLE_PALETTE,
-        )
+        self.tile_rendering = tile_rendering
+        self.wall_map = wall_map
+        self.grid_renderer = None
+        self.apple_sounds = None
+        self.replay_directory = replay_directory
+        self.recorder = None
+        self.scene = MenuScene(self)
+        self.play_again = None
+        self.profile_path = profile_path
+        self.profiler = None
 
     def play(self):
-        self._run_start_menu()
         clock = pygame.time.Clock()
-        self.stats_banner.announce_level_change()
-
-        while True:
-            clock.tick(self.clock_speed)
-            self._handle_input_events()
-            self._update()
-            self._draw()
-            self._checks()
-            pygame.display.flip()
-            if self.grid.check_snake_collision():
-                self._game_lost()
-                break
-
-    def _update(self):
-        self.stats_banner.update()
-        self.grid.update()
-
-    def _draw(self):
-        self.grid.draw(self.screen)
-        self.stats_banner.draw(self.screen)
-        pygame.display.flip()
-
-    def _checks(self):
-        is_collision = self.grid.check_apple_eaten()
-        if is_collision:
-            self.stats_banner.score += 1
-            if self.stats_banner.score == POINTS_PER_LEVEL:
-                self._update_level()
-
-    def _run_start_menu(self):
-        settings = self.start_menu.get_users_settings()
+        try:
+            while self.scene is not None:
+                if self.scene.is_waiting():
+                    # nothing changes until there's input or a pause is over, so sleep until then
+                    events = [pygame.event.wait(self.scene.wait_ms())] + pygame.event.get()
+                    elapsed_ms = clock.tick()
+                else:
+                    elapsed_ms = clock.tick(self.scene.frame_rate)
+                    events = pygame.event.get()
+                for event in events:
+                    if event.type == QUIT or (event.type == KEYDOWN and event.key == K_ESCAPE):
+                        pygame.quit()
+                        sys.exit()
+                    elif event.type in [NOEVENT, WINDOWEXPOSED, VIDEOEXPOSE]:
+                        pygame.display.flip()
+                self.scene.handle_events(events)
+                next_scene = self.scene.update(elapsed_ms)
+                self.scene.draw(self.screen)
+                self.scene = next_scene
+        finally:
+            if self.profiler:
+                self.profiler.dump_csv(self._game_profile_path())
+        return self.play_again
+
+    def start_game(self, settings):
+        previous_grid = self.grid
+        self.settings = settings
+        self.games_started += 1
         self.clock_speed = settings[0]
-        snake = Snake(settings[1], settings[2])
-        dimensions = (settings[3][0] * TILE_WIDTH_PIXELS, settings[3][1] * TILE_WIDTH_PIXELS)
-        self.grid = Grid(dimensions, GREEN_PALETTE, snake)
-        self.window_dimensions = self.grid.dimensions[0], self.grid.dimensions[1] + BANNER_DIMENSIONS[1]
-        self.stats_banner = StatsBanner(self.grid.dimensions, GREEN_PALETTE[2])
-        self.start_menu.show_directions()
-        wait_for_keypress()
-        self.screen = pygame.display.set_mode((self.grid.dimensions[0], self.grid.dimensions[1] + BANNER_DIMENSIONS[1]))
-
-    def _update_level(self):
-        if self.stats_banner.level == 10:
-            self._game_won()
-        self.grid.level_up()
-        self.stats_banner.level += 1
-        self.stats_banner.score = 0
-        self.stats_banner.announce_level_change()
-
-        if self.stats_banner.level == 10:  # final level
-            self.grid.snake.color = YARN_COLOR
-            palette = GREY_PALETTE
+        self._start_simulation()
+        is_same_board = (previous_grid is not None and previous_grid.dimensions == self.grid.dimensions
+                         and previous_grid.brick_wall.mask == self.grid.brick_wall.mask)
+        if is_same_board:
+            # a grid the same size with the same wall looks the same, so the renderer's layers are kept
+            self.grid_renderer.reset(self.grid)
+            self.stats_banner.reset(GREEN_PALETTE[2])
         else:
-            palette = self.color_palettes[(self.stats_banner.level - 1) % len(self.color_palettes)]
-        self.grid.change_color(palette[0], palette[1])
-        self.stats_banner.change_color(palette[2])
-
-    def _handle_input_events(self):
-        for event in pygame.event.get():
-            if event.type == QUIT:
-                pygame.quit()
-                sys.exit()
-            elif event.type == KEYDOWN and event.key == K_ESCAPE:
-                pygame.quit()
-                sys.exit()
-            elif event.type == KEYDOWN and event.key in ARROW_KEYS:
-                self.grid.snake.head.command_pending = event.key
-
-    def _game_lost(self):
-        pygame.mixer.Sound(SOUND_PATH + LOSS_SOUND).play()
-        time.sleep(3.5)
-
-        font_huge = pygame.font.Font(FONT_PATH + STANDARD_FONT, FONT_SIZE_HUGE)
-        font_large = pygame.font.Font(FONT_PATH + STANDARD_FONT, FONT_SIZE_LARGE)
-
-        you_lost_text = font_huge.render("YOU LOST", True, DARK_GRAY)
-        you_lost_rect = you_lost_text.get_rect()
-        you_lost_rect.center = self.grid.dimensions[0] * 0.5, (self.grid.dimensions[1] * 0.45) + BANNER_DIMENSIONS[1]
-
-        play_again_text = font_large.render("Play again? Y / N", True, DARK_GRAY)
-        play_again_rect = play_again_text.get_rect()
-        play_again_rect.center = self.grid.dimensions[0] * 0.5, (self.grid.dimensions[1] * 0.55) + BANNER_DIMENSIONS[1]
-
-        self.screen.blit(you_lost_text, you_lost_rect)
-        self.screen.blit(play_again_text, play_again_rect)
-        pygame.display.flip()
-
-    def _game_won(self):
-        pygame.mixer.Sound(SOUND_PATH + VICTORY_SOUND).play()
-        font_huge = pygame.font.Font(FONT_PATH + STANDARD_FONT, FONT_SIZE_HUGE)
-        text = font_huge.render("YOU WON!", True, DARK_GRAY)
-        text_rect = text.get_rect()
-        text_rect.center = self.grid.dimensions[0] * 0.5, (self.grid.dimensions[1] * 0.5) + BANNER_DIMENSIONS[1]
-        self.screen.blit(text, text_rect)
-        pygame.display.flip()
-        time.sleep(3)
-        wait_for_keypress()
-        pygame.quit()
-        sys.exit()
-
-
-def prompt_play_again():
-    clock = pygame.time.Clock()
-    pygame.event.clear()
-    while True:
-        clock.tick(10)
-        for event in pygame.event.get():
-            if event.type == QUIT:
-                pygame.quit()
-                sys.exit()
-            elif event.type == KEYDOWN and event.key == K_ESCAPE:
-                pygame.quit()
-                sys.exit()
-            elif event.type == KEYDOWN and event.key == K_y:
-                return True
-            elif event.type == KEYDOWN and event.key == K_n:
-                return False
-
-
-def wait_for_keypress():
-    clock = pygame.time.Clock()
-    pygame.event.clear()
-    while True:
-        clock.tick(10)
-        for event in pygame.event.get():
-            if event.type == QUIT:
-                pygame.quit()
-                sys.exit()
-            elif event.type == KEYDOWN and event.key == K_ESCAPE:
-                pygame.quit()
-                sys.exit()
-            elif event.type == KEYDOWN:
-                return
+            self.grid_renderer = create_renderer(self.grid, self.tile_rendering)
+            self.stats_banner = StatsBanner(self.grid_renderer.rect.size, GREEN_PALETTE[2])
+        view_dimensions = self.grid_renderer.rect.size
+        self.window_dimensions = view_dimensions[0], view_dimensions[1] + BANNER_DIMENSIONS[1]
+        # whatever the background thread has read is made into sounds, fonts and images before the game starts
+        assets.preload()
+        self.apple_sounds = {
+            RED: assets.sound(BEEP1_SOUND),
+            POISON: assets.sound(BEEP2_SOUND),
+            GOLDEN: assets.sound(GLOSS_SOUND),
+        }
+        self.dropped_frames = 0
+        self.simulation_lag = 0.0
+        self.profiler = FrameProfiler() if self.profile_path else None
+
+    def show_grid(self):
+        self.screen = pygame.display.set_mode(self.window_dimensions)
+        self.grid_renderer.prepare_palettes(self.simulation.color_palettes + (GREY_PALETTE,))
+
+    def reset(self):
+        self.play_again = None
+        # the last game's timings were saved when it ended
+        self.profiler = None
+        self.start_menu.is_submitted = False
+        self.window_dimensions = DEFAULT_WINDOW_DIMENSIONS
+        self.screen = pygame.display.set_mode(self.window_dimensions)
+        self.scene = MenuScene(self)
+
+    def save_replay(self):
+        if self.replay_directory is None:
+            return
+        os.makedirs(self.replay_directory, exist_ok=True)
+        file_name = "{}-{}.replay".format(time.strftime("%Y%m%d-%H%M%S"), self.simulation.seed)
+        self.recorder.save(os.path.join(self.replay_directory, file_name))
+
+    def _game_profile_path(self):
+        root, extension = os.path.splitext(self.profile_path)
+        return "{}-{}{}".format(root, self.games_started, extension)
+
+    def _start_simulation(self):
+        settings = self.settings
+        grid_dimensions, snake_elongation_factor = settings[3], settings[2]
+        if self.wall_map:
+            # the elongation factor is scaled to the grid size picked in the menu, so scale it to the map's instead
+            grid_dimensions = (self.wall_map.columns, self.wall_map.rows)
+            snake_elongation_factor = (snake_elongation_factor * grid_dimensions[0] * grid_dimensions[1]
+                                       // (settings[3][0] * settings[3][1]))
+        self.simulation = Simulation(grid_dimensions, settings[1], snake_elongation_factor, wall_map=self.wall_map)
+        self.recorder = ReplayRecorder(self.simulation, settings[1])
+        self.grid = self.simulation.grid
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Play snake.")
+    parser.add_argument("--record", metavar="DIRECTORY", help="save a replay of every game to this directory")
+    parser.add_argument("--profile", metavar="CSV", nargs="?", const=DEFAULT_PROFILE_PATH,
+                        default=os.environ.get(PROFILER_ENVIRONMENT_VARIABLE),
+                        help="time every frame, show the timings with F3 and save each game's to a numbered CSV")
+    parser.add_argument("--tile-rendering", action="store_true",
+                        help="draw the grid at one pixel per step of the snake and scale it up to the window")
+    parser.add_argument("--map", metavar="FILE",
+                        help="play on the wall layout in a map file, such as those in " + MAP_PATH)
+    args = parser.parse_args()
+    wall_map = load_wall_map(args.map) if args.map else None
     pygame.init()
     if not pygame.font: print("Was not able to initialize fonts.")
     if not pygame.mixer: print("Was not able to initialize sounds.")
-    while True:
-        game = Game()
-        game.play()
-        play_again = prompt_play_again()
-        if not play_again:
-            pygame.quit()
-            break
+    game = Game(args.record, args.profile, args.tile_rendering, wall_map)
+    while game.play():
+        game.reset()
+    pygame.quit()
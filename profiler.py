@@ -0,0 +1,142 @@
+import csv
+from array import array
+from time import perf_counter_ns
+
+import pygame
+from assets import assets
+from config import *
+from textcache import render_text
+
+PROFILED_PHASES = ("input", "update", "banner update", "grid update", "draw", "checks", "flip")
+
+
+class FrameProfiler:
+    """
+    Times each phase of every drawn frame of the game.
+
+    Phases are timed by wrapping the functions that run them, so a game that isn't being profiled runs
+    exactly as it would without the profiler. The time each phase takes is added up until the frame is
+    shown, then stored in a ring buffer holding the most recent frames.
+
+    ...
+
+    Attributes
+    ----------
+    capacity : int
+        the number of frames kept
+    timings : dict
+        a ring buffer of nanoseconds spent per frame, keyed by phase
+    calls : dict
+        a ring buffer of how many times each phase ran per frame, keyed by phase
+    snake_lengths : array of int
+        a ring buffer of how many pieces the snake had at the end of each frame
+    piece_counts : array of int
+        a ring buffer of how many sprites were on the grid at the end of each frame
+    frames : int
+        the number of frames recorded so far
+    is_overlay_visible : bool
+        whether the timings are drawn over the game
+
+    Methods
+    -------
+    timed(phase, function)
+        return a version of function that adds the time it takes to phase
+    end_frame(snake_length, piece_count)
+        store the current frame's timings and start on the next frame
+    toggle_overlay()
+        show or hide the timings overlay
+    draw_overlay(surface)
+        draw the timings over the game, returns the area drawn
+    percentiles(phase)
+        the median and 99th percentile time of a phase, in microseconds
+    dump_csv(path)
+        write every stored frame to a csv file, oldest first
+    """
+    def __init__(self, capacity=PROFILER_CAPACITY):
+        self.capacity = capacity
+        self.timings = {phase: array('q', bytes(8 * capacity)) for phase in PROFILED_PHASES}
+        self.calls = {phase: array('i', bytes(4 * capacity)) for phase in PROFILED_PHASES}
+        self.snake_lengths = array('i', bytes(4 * capacity))
+        self.piece_counts = array('i', bytes(4 * capacity))
+        self.frames = 0
+        self.is_overlay_visible = False
+        self.font = assets.font(STANDARD_FONT, FONT_SIZE_XSMALL)
+        self._index = 0
+        self._overlay = None
+
+    def timed(self, phase, function):
+        timings = self.timings[phase]
+        calls = self.calls[phase]
+
+        def timed_function(*args):
+            start = perf_counter_ns()
+            result = function(*args)
+            timings[self._index] += perf_counter_ns() - start
+            calls[self._index] += 1
+            return result
+        return timed_function
+
+    def end_frame(self, snake_length, piece_count):
+        self.snake_lengths[self._index] = snake_length
+        self.piece_counts[self._index] = piece_count
+        self.frames += 1
+        self._index = self.frames % self.capacity
+        for phase in PROFILED_PHASES:
+            self.timings[phase][self._index] = 0
+            self.calls[phase][self._index] = 0
+        if self.is_overlay_visible and self.frames % PROFILER_OVERLAY_REFRESH_FRAMES == 0:
+            self._overlay = None
+
+    def toggle_overlay(self):
+        self.is_overlay_visible = not self.is_overlay_visible
+        self._overlay = None
+
+    def draw_overlay(self, surface):
+        if self._overlay is None:
+            self._overlay = self._render_overlay()
+        return surface.blit(self._overlay, (TILE_WIDTH_PIXELS, BANNER_DIMENSIONS[1] + TILE_WIDTH_PIXELS))
+
+    def percentiles(self, phase):
+        timings = sorted(self._recorded(self.timings[phase]))
+        if not timings:
+            return 0, 0
+        return timings[len(timings) // 2] // 1000, timings[len(timings) * 99 // 100] // 1000
+
+    def dump_csv(self, path):
+        with open(path, "w", newline="") as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(["frame", "ticks", "snake_length", "piece_count"]
+                            + [phase.replace(" ", "_") + "_ns" for phase in PROFILED_PHASES])
+            columns = [self.calls["update"], self.snake_lengths, self.piece_counts]
+            columns += [self.timings[phase] for phase in PROFILED_PHASES]
+            columns = [self._recorded(column) for column in columns]
+            first_frame = self.frames - len(columns[0])
+            for frame, row in enumerate(zip(*columns), first_frame):
+                writer.writerow((frame,) + row)
+
+    def _recorded(self, ring_buffer):
+        """The finished frames in a ring buffer, oldest first."""
+        count = min(self.frames, self.capacity - 1)
+        start = (self._index - count) % self.capacity
+        if start + count <= self.capacity:
+            return ring_buffer[start:start + count]
+        return ring_buffer[start:] + ring_buffer[:start + count - self.capacity]
+
+    def _render_overlay(self):
+        rows = [("phase (us)", "p50", "p99")]
+        rows += [(phase,) + tuple(str(time) for time in self.percentiles(phase)) for phase in PROFILED_PHASES]
+        latest = (self._index - 1) % self.capacity
+        rows.append(("snake length", str(self.snake_lengths[latest]), ""))
+        rows.append(("pieces", str(self.piece_counts[latest]), ""))
+        line_height = self.font.get_linesize()
+        column_width = self.font.size("000000")[0]
+        name_width = self.font.size("banner update ")[0]
+        overlay = pygame.Surface((name_width + 2 * column_width, line_height * len(rows))).convert()
+        overlay.fill(DARK_GRAY)
+        for number, (name, *values) in enumerate(rows):
+            top = number * line_height
+            overlay.blit(render_text(self.font, name, WHITE, DARK_GRAY), (0, top))
+            for column, value in enumerate(values, 1):
+                text = render_text(self.font, value, WHITE, DARK_GRAY)
+                overlay.blit(text, (name_width + column * column_width - text.get_width(), top))
+        return overlay
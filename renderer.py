@@ -0,0 +1,553 @@
+from collections import deque
+
+import numpy as np
+import pygame
+from config import *
+from tiles import ChunkIndex
+
+
+class GridRenderer:
+    """
+    Draws a grid, and the snake, apples, and wall on it, to the screen.
+
+    The grid and everything on it are stored as plain coordinates so the game can be simulated without
+    a display. This is the thin layer that turns those coordinates into pixels.
+
+    Only what changed since the last frame is drawn. Each piece of the snake keeps its color as it
+    slides into the spot of the piece ahead of it, so every spot the snake covers changes color each
+    frame and the snake is always redrawn. The rest of the grid is only touched where the tail moved
+    off of it or an apple came or went. The areas drawn are returned so that only those parts of the
+    screen need to be updated.
+
+    The background and wall never change between level ups, so they are drawn together onto a single
+    static layer for each palette. Redrawing the grid, or erasing part of it, is one blit from that layer.
+    The snake is drawn from a tile for each color in its palette, all in a single call to blits.
+
+    ...
+
+    Attributes
+    ----------
+    grid : Grid
+        the grid being drawn
+    static_layers : dict
+        the background with the wall drawn on it, keyed by the background and wall colors
+    static_layer : pygame.Surface
+        the static layer for the grid's current colors
+    piece_tiles : list of pygame.Surface
+        a piece of the snake in each color of its palette
+    rect : pygame.Rect
+        coordinates of the grid on the screen
+
+    Methods
+    -------
+    draw(surface)
+        draw what changed on the grid since the last frame to the screen, returns the areas drawn
+    invalidate()
+        redraw the whole grid on the next frame
+    prepare_palettes(palettes)
+        build the static layers for each palette ahead of time
+    reset(grid)
+        draw a new grid of the same size and with the same wall from now on, keeping the static layers
+    """
+    def __init__(self, grid):
+        self.grid = grid
+        self.static_layers = {}
+        self.static_layer = None
+        self.piece_tiles = None
+        self.rect = pygame.Rect((0, BANNER_DIMENSIONS[1]), grid.dimensions)
+        self._tiled_palette = None
+        self._static_layer_colors = None
+        self._drawn_snake_positions = set()
+        self._drawn_apples = set()
+        self._is_invalid = True
+
+    def invalidate(self):
+        self._is_invalid = True
+
+    def prepare_palettes(self, palettes):
+        for palette in palettes:
+            self._get_static_layer(palette[0], palette[1])
+
+    def reset(self, grid):
+        self.grid = grid
+        self._static_layer_colors = None
+        self._drawn_snake_positions = set()
+        self._drawn_apples = set()
+        self._is_invalid = True
+
+    def draw(self, surface):
+        self._refresh_colors()
+        if self._tiled_palette is not self.grid.snake.palette:
+            self._tiled_palette = self.grid.snake.palette
+            self.piece_tiles = make_piece_tiles(self._tiled_palette)
+        pieces = wrap_pieces(list(self.grid.snake.pieces()), *self.grid.dimensions)
+        apples = {(apple.x, apple.y, apple.color) for apple in self.grid.other_apples}
+        if self.grid.red_apple.is_placed:
+            apples.add((self.grid.red_apple.x, self.grid.red_apple.y, self.grid.red_apple.color))
+
+        # squares hanging over an edge of the grid are cut off there rather than drawn over the banner
+        surface.set_clip(self.rect)
+        if self._is_invalid:
+            dirty_rects = self._draw_everything(surface, pieces, apples)
+        else:
+            dirty_rects = self._draw_changes(surface, pieces, apples)
+        surface.set_clip(None)
+
+        self._drawn_snake_positions = {(x, y) for x, y, _ in pieces}
+        self._drawn_apples = apples
+        self._is_invalid = False
+        return [rect.clip(self.rect) for rect in dirty_rects]
+
+    def _draw_everything(self, surface, pieces, apples):
+        surface.blit(self.static_layer, self.rect)
+        top = self.rect.top
+        for x, y, color in apples:
+            surface.fill(color, (x, y + top, TILE_WIDTH_PIXELS, TILE_WIDTH_PIXELS))
+        self._draw_snake(surface, pieces)
+        return [self.rect.copy()]
+
+    def _draw_changes(self, surface, pieces, apples):
+        top = self.rect.top
+        dirty_rects = []
+        positions = {(x, y) for x, y, _ in pieces}
+        for x, y in self._drawn_snake_positions - positions:
+            dirty_rects.append(self._erase(surface, x, y))
+        for x, y, _ in self._drawn_apples - apples:
+            dirty_rects.append(self._erase(surface, x, y))
+        for x, y, color in apples - self._drawn_apples:
+            dirty_rects.append(surface.fill(color, (x, y + top, TILE_WIDTH_PIXELS, TILE_WIDTH_PIXELS)))
+        self._draw_snake(surface, pieces)
+        dirty_rects.extend(self._snake_rects(pieces))
+        return dirty_rects
+
+    def _draw_snake(self, surface, pieces):
+        tiles = self.piece_tiles
+        top = self.rect.top
+        surface.blits([(tiles[color_index], (x, y + top)) for x, y, color_index in pieces], doreturn=False)
+
+    def _erase(self, surface, x, y):
+        area = pygame.Rect(x, y, TILE_WIDTH_PIXELS, TILE_WIDTH_PIXELS)
+        return surface.blit(self.static_layer, area.move(0, self.rect.top), area)
+
+    def _snake_rects(self, pieces):
+        """Cover the snake with as few rects as possible by merging straight runs of pieces."""
+        rects = []
+        left, top, _ = pieces[0]
+        right = left + TILE_WIDTH_PIXELS
+        bottom = top + TILE_WIDTH_PIXELS
+        for x, y, _ in pieces:
+            if x == left and right - left == TILE_WIDTH_PIXELS and top - TILE_WIDTH_PIXELS <= y <= bottom:
+                top = min(top, y)
+                bottom = max(bottom, y + TILE_WIDTH_PIXELS)
+            elif y == top and bottom - top == TILE_WIDTH_PIXELS and left - TILE_WIDTH_PIXELS <= x <= right:
+                left = min(left, x)
+                right = max(right, x + TILE_WIDTH_PIXELS)
+            else:
+                rects.append(pygame.Rect(left, top + self.rect.top, right - left, bottom - top))
+                left, top = x, y
+                right = left + TILE_WIDTH_PIXELS
+                bottom = top + TILE_WIDTH_PIXELS
+        rects.append(pygame.Rect(left, top + self.rect.top, right - left, bottom - top))
+        return rects
+
+    def _refresh_colors(self):
+        colors = (self.grid.background_color, self.grid.brick_wall.color)
+        if colors != self._static_layer_colors:
+            self._static_layer_colors = colors
+            self.static_layer = self._get_static_layer(*colors)
+            self._is_invalid = True
+
+    def _get_static_layer(self, background_color, wall_color):
+        static_layer = self.static_layers.get((background_color, wall_color))
+        if static_layer is None:
+            blocks = list(self.grid.brick_wall.blocks())
+            brick_images = {size: make_brick_image(wall_color, size) for _, _, size in blocks}
+            static_layer = pygame.Surface(self.grid.dimensions).convert()
+            static_layer.fill(background_color)
+            static_layer.blits([(brick_images[size], (x, y)) for x, y, size in blocks], doreturn=False)
+            self.static_layers[(background_color, wall_color)] = static_layer
+        return static_layer
+
+
+class ViewportRenderer:
+    """
+    Draws the part of a large grid around the snake's head to a window of a fixed size.
+
+    A camera centered on the head picks out the area of the grid to draw, and only the sprites inside
+    it are drawn, so the cost of a frame depends on the size of the window and not of the grid. Bricks,
+    apples, and snake pieces are filed into chunks of the grid so the visible ones can be found without
+    looking at the rest. The snake's pieces keep their spots while their colors slide down the snake, so
+    each spot is filed once, when the head leaves it, along with the move it was left on; how many moves
+    ago that was gives the piece's place in the snake, and so the squares drawn for it. Where pieces
+    share a spot, the one nearest the tail is drawn on top, so that is the one kept track of.
+    The grid wraps around at its edges, so near an edge the pieces on the far side of the grid are
+    looked up too, and squares hanging over an edge are drawn on both sides of it.
+
+    Since the camera moves with the head, the whole window is drawn every frame, straight onto the screen.
+
+    ...
+
+    Attributes
+    ----------
+    grid : Grid
+        the grid being drawn
+    rect : pygame.Rect
+        coordinates of the window onto the grid on the screen
+    camera : pygame.Rect
+        the area of the grid shown in the window, in grid coordinates
+    brick_images : dict
+        the image of a brick, keyed by the wall color and the brick's size
+    piece_tiles : list of pygame.Surface
+        a piece of the snake in each color of its palette
+
+    Methods
+    -------
+    draw(surface)
+        draw the area of the grid around the snake's head, returns the area drawn
+    invalidate()
+        does nothing, as the whole window is drawn every frame
+    prepare_palettes(palettes)
+        build the brick images for each palette ahead of time
+    reset(grid)
+        draw a new grid of the same size and with the same wall from now on, keeping the filed bricks
+        and brick images
+    """
+    def __init__(self, grid, viewport_tiles=VIEWPORT_TILES):
+        self.grid = grid
+        columns = min(grid.columns, viewport_tiles[0])
+        rows = min(grid.rows, viewport_tiles[1])
+        self.rect = pygame.Rect(0, BANNER_DIMENSIONS[1], columns * TILE_WIDTH_PIXELS, rows * TILE_WIDTH_PIXELS)
+        self.camera = pygame.Rect(0, 0, self.rect.width, self.rect.height)
+        self.brick_images = {}
+        self.piece_tiles = None
+        self._tiled_palette = None
+        self._bricks = ChunkIndex(VIEWPORT_CHUNK_TILES * TILE_WIDTH_PIXELS)
+        self._brick_sizes = set()
+        for x, y, size in grid.brick_wall.blocks():
+            self._bricks.add(x, y, (x, y, size))
+            self._brick_sizes.add(size)
+        self._pieces = ChunkIndex(VIEWPORT_CHUNK_TILES * TILE_WIDTH_PIXELS)
+        self._piece_moves = {}
+        self._filed_pieces = deque()
+        self._filed_moves = None
+
+    def invalidate(self):
+        pass
+
+    def prepare_palettes(self, palettes):
+        for palette in palettes:
+            for size in self._brick_sizes:
+                self._get_brick_image(palette[1], size)
+
+    def reset(self, grid):
+        self.grid = grid
+        # the new snake's pieces are filed from scratch on the next frame
+        self._filed_moves = None
+
+    def draw(self, surface):
+        if self._tiled_palette is not self.grid.snake.palette:
+            self._tiled_palette = self.grid.snake.palette
+            self.piece_tiles = make_piece_tiles(self._tiled_palette)
+        self._file_snake_pieces()
+        self._follow_head()
+        left = self.rect.left - self.camera.left
+        top = self.rect.top - self.camera.top
+        # sprites are filed by their top left corner, so look far enough up and to the left to find the
+        # bricks hanging into view, and a tile further down and to the right for the snake's squares
+        search_area = self.camera.inflate(3 * TILE_WIDTH_PIXELS, 3 * TILE_WIDTH_PIXELS)
+        search_area.topleft = (self.camera.left - 2 * TILE_WIDTH_PIXELS, self.camera.top - 2 * TILE_WIDTH_PIXELS)
+
+        surface.set_clip(self.rect)
+        surface.fill(self.grid.background_color, self.rect)
+        brick_images = {size: self._get_brick_image(self.grid.brick_wall.color, size) for size in self._brick_sizes}
+        bricks = self._bricks.items_in(search_area)
+        surface.blits([(brick_images[size], (x + left, y + top)) for x, y, size in bricks], doreturn=False)
+        # apples sit on whole tiles inside the grid, so only those filed in view need to be looked at
+        apples = list(self.grid.other_apples.apples_in(self.camera))
+        if self.grid.red_apple.is_placed:
+            apples.append(self.grid.red_apple)
+        # fill is handed rects already clipped to the window, as it misplaces rects hanging off the top or
+        # left edge of the screen
+        window = self.rect
+        for apple in apples:
+            surface.fill(apple.color, window.clip(apple.x + left, apple.y + top, apple.size, apple.size))
+
+        # tiles closer to the head are drawn first, like the rest of the game draws them
+        snake = self.grid.snake
+        piece_moves = self._piece_moves
+        visible_tiles = sorted(snake.moves - piece_moves[position][0] for position in self._pieces_in(search_area))
+        squares = [square for index in [0] + visible_tiles for square in snake.tile_pieces(index)]
+        tiles = self.piece_tiles
+        surface.blits([(tiles[color_index], (x + left, y + top))
+                       for x, y, color_index in wrap_pieces(squares, *self.grid.dimensions)], doreturn=False)
+        surface.set_clip(None)
+        return [self.rect.copy()]
+
+    def _follow_head(self):
+        head = self.grid.snake.head
+        left = head.x + TILE_WIDTH_PIXELS // 2 - self.camera.width // 2
+        top = head.y + TILE_WIDTH_PIXELS // 2 - self.camera.height // 2
+        self.camera.left = max(0, min(left, self.grid.dimensions[0] - self.camera.width))
+        self.camera.top = max(0, min(top, self.grid.dimensions[1] - self.camera.height))
+
+    def _pieces_in(self, area):
+        """The spots of the filed pieces in area, which may reach past an edge of the grid round to the other side."""
+        width, height = self.grid.dimensions
+        x_offsets = {0, -width if area.right > width else 0, width if area.left < 0 else 0}
+        y_offsets = {0, -height if area.bottom > height else 0, height if area.top < 0 else 0}
+        positions = set()
+        for x_offset in x_offsets:
+            for y_offset in y_offsets:
+                positions.update(self._pieces.items_in(area.move(x_offset, y_offset)))
+        return positions
+
+    def _file_snake_pieces(self):
+        """Bring the filed pieces up to date with the snake's moves since the last frame."""
+        snake = self.grid.snake
+        if self._filed_moves is None or snake.moves - self._filed_moves > snake.body_length:
+            self._refile_snake_pieces()
+            return
+        for index in range(snake.moves - self._filed_moves, 0, -1):
+            self._file_piece(*snake.position(index), snake.moves - index)
+        while len(self._filed_pieces) > snake.body_length:
+            self._unfile_piece(*self._filed_pieces.pop())
+        self._filed_moves = snake.moves
+
+    def _refile_snake_pieces(self):
+        snake = self.grid.snake
+        self._pieces = ChunkIndex(VIEWPORT_CHUNK_TILES * TILE_WIDTH_PIXELS)
+        self._piece_moves = {}
+        self._filed_pieces = deque()
+        for index in range(snake.body_length, 0, -1):
+            self._file_piece(*snake.position(index), snake.moves - index)
+        self._filed_moves = snake.moves
+
+    def _file_piece(self, x, y, move):
+        moves = self._piece_moves.get((x, y))
+        if moves is None:
+            self._piece_moves[(x, y)] = [move]
+            self._pieces.add(x, y, (x, y))
+        else:
+            moves.append(move)
+        self._filed_pieces.appendleft((x, y, move))
+
+    def _unfile_piece(self, x, y, move):
+        moves = self._piece_moves[(x, y)]
+        del moves[0]
+        if not moves:
+            del self._piece_moves[(x, y)]
+            self._pieces.remove(x, y, (x, y))
+
+    def _get_brick_image(self, wall_color, size):
+        brick_image = self.brick_images.get((wall_color, size))
+        if brick_image is None:
+            brick_image = make_brick_image(wall_color, size)
+            self.brick_images[(wall_color, size)] = brick_image
+        return brick_image
+
+
+class TileRenderer:
+    """
+    Draws a grid at one pixel per step the snake takes, then scales it up onto the screen in one go.
+
+    Everything on the grid sits on a lattice of BOARD_PIXEL_SIZE pixel steps, so a board with a pixel
+    per step holds the whole picture. The apples and snake are written into the board's pixels with a
+    few NumPy array operations instead of a fill per piece, and the board is scaled to the size of the
+    grid with a single transform, however long the snake gets.
+
+    The background and wall are drawn onto a static board for each palette, which every frame starts
+    from. At this resolution the black border of a brick is one step wide.
+
+    ...
+
+    Attributes
+    ----------
+    grid : Grid
+        the grid being drawn
+    static_boards : dict
+        the background with the wall drawn on it at board resolution, keyed by the background and wall colors
+    board : pygame.Surface
+        the grid at one pixel per step
+    rect : pygame.Rect
+        coordinates of the grid on the screen
+
+    Methods
+    -------
+    draw(surface)
+        draw the whole grid to the screen, returns the area drawn
+    invalidate()
+        does nothing, as the whole grid is drawn every frame
+    prepare_palettes(palettes)
+        build the static boards for each palette ahead of time
+    reset(grid)
+        draw a new grid of the same size and with the same wall from now on, keeping the static boards
+    """
+    def __init__(self, grid):
+        self.grid = grid
+        self.static_boards = {}
+        self.board = pygame.Surface((grid.dimensions[0] // BOARD_PIXEL_SIZE, grid.dimensions[1] // BOARD_PIXEL_SIZE),
+                                    0, 32)
+        self.rect = pygame.Rect((0, BANNER_DIMENSIONS[1]), grid.dimensions)
+        self._packed_palette = None
+        self._snake_colors = None
+        steps = TILE_WIDTH_PIXELS // BOARD_PIXEL_SIZE
+        # the board pixels covered by a sprite, relative to its top left pixel
+        self._sprite_xs = np.tile(np.arange(steps), steps)
+        self._sprite_ys = np.repeat(np.arange(steps), steps)
+
+    def invalidate(self):
+        pass
+
+    def prepare_palettes(self, palettes):
+        for palette in palettes:
+            self._get_static_board(palette[0], palette[1])
+
+    def reset(self, grid):
+        self.grid = grid
+        self._packed_palette = None
+
+    def draw(self, surface):
+        self.board.blit(self._get_static_board(self.grid.background_color, self.grid.brick_wall.color), (0, 0))
+        xs, ys, colors = self._sprite_pixels()
+        pixels = pygame.surfarray.pixels2d(self.board)
+        pixels[xs, ys] = colors
+        del pixels
+        if surface.get_bitsize() == 32 and surface.get_masks() == self.board.get_masks():
+            pygame.transform.scale(self.board, self.rect.size, surface.subsurface(self.rect))
+        else:
+            surface.blit(pygame.transform.scale(self.board, self.rect.size), self.rect)
+        return [self.rect.copy()]
+
+    def _sprite_pixels(self):
+        """The board pixels covered by the apples and snake and their packed colors, in the order they're drawn."""
+        apples = self.grid.other_apples.apples
+        if self.grid.red_apple.is_placed:
+            apples = apples + [self.grid.red_apple]
+        snake_xs, snake_ys, snake_color_indices = self._snake_squares()
+        xs = np.concatenate((np.array([apple.x for apple in apples], np.int64), snake_xs))
+        ys = np.concatenate((np.array([apple.y for apple in apples], np.int64), snake_ys))
+        colors = np.concatenate((np.array([pack_color(apple.color) for apple in apples], np.uint32),
+                                 self._get_snake_colors()[snake_color_indices]))
+
+        xs = (xs[:, np.newaxis] // BOARD_PIXEL_SIZE + self._sprite_xs).ravel()
+        ys = (ys[:, np.newaxis] // BOARD_PIXEL_SIZE + self._sprite_ys).ravel()
+        colors = np.repeat(colors, len(self._sprite_xs))
+        # squares hanging over the right or bottom edge of the grid show on the opposite edge
+        width, height = self.board.get_size()
+        xs %= width
+        ys %= height
+        # pieces later in the arrays are drawn over earlier ones, so the tail ends up on top; NumPy doesn't
+        # say which write wins when an index is assigned twice, so only the last one at each pixel is kept
+        _, last_from_end = np.unique((ys * width + xs)[::-1], return_index=True)
+        drawn = len(xs) - 1 - last_from_end
+        return xs[drawn], ys[drawn], colors[drawn]
+
+    def _snake_squares(self):
+        """The position and palette index of every square Snake.pieces would give, worked out all at once."""
+        snake = self.grid.snake
+        length = snake.body_length
+        body_xs, body_ys = snake.body_positions()
+        tile_xs = np.concatenate(([snake.head.x], np.frombuffer(body_xs, np.int32), [snake.vacated_position[0]]))
+        tile_ys = np.concatenate(([snake.head.y], np.frombuffer(body_ys, np.int32), [snake.vacated_position[1]]))
+        step_xs = self._wrapped_distances(np.diff(tile_xs), self.grid.dimensions[0]) // TICKS_PER_MOVE
+        step_ys = self._wrapped_distances(np.diff(tile_ys), self.grid.dimensions[1]) // TICKS_PER_MOVE
+
+        lag = TICKS_PER_MOVE - 1 - snake.ticks_since_move
+        steps = np.arange(lag, length * TICKS_PER_MOVE + lag + 1)
+        tiles, steps_back = np.divmod(steps, TICKS_PER_MOVE)
+        xs = (tile_xs[tiles] + steps_back * step_xs[tiles]) % self.grid.dimensions[0]
+        ys = (tile_ys[tiles] + steps_back * step_ys[tiles]) % self.grid.dimensions[1]
+
+        color_indices = np.zeros(len(steps), np.int64)
+        if length:
+            tile_color_indices = np.frombuffer(snake.body_color_indices, np.uint8).astype(np.int64)
+            next_color_indices = np.append(tile_color_indices[1:], tile_color_indices[-1])
+            color_tiles, blends = np.divmod(steps[1:] - lag - 1, TICKS_PER_MOVE)
+            color_tiles = np.minimum(color_tiles, length - 1)
+            first = tile_color_indices[color_tiles]
+            second = next_color_indices[color_tiles]
+            blended = first + (second - first) * blends // TICKS_PER_MOVE
+            color_indices[1:] = np.where((first > 0) & (second > 0), blended, first)
+        return xs, ys, color_indices
+
+    @staticmethod
+    def _wrapped_distances(distances, grid_length):
+        distances = np.where(distances > TILE_WIDTH_PIXELS, distances - grid_length, distances)
+        return np.where(distances < -TILE_WIDTH_PIXELS, distances + grid_length, distances)
+
+    def _get_snake_colors(self):
+        """The snake's palette, packed."""
+        if self._packed_palette is not self.grid.snake.palette:
+            self._packed_palette = self.grid.snake.palette
+            self._snake_colors = np.array([pack_color(color) for color in self._packed_palette], np.uint32)
+        return self._snake_colors
+
+    def _get_static_board(self, background_color, wall_color):
+        static_board = self.static_boards.get((background_color, wall_color))
+        if static_board is None:
+            static_board = pygame.Surface(self.board.get_size(), 0, self.board)
+            static_board.fill(background_color)
+            for x, y, size in self.grid.brick_wall.blocks():
+                brick_rect = pygame.Rect(x // BOARD_PIXEL_SIZE, y // BOARD_PIXEL_SIZE,
+                                         size // BOARD_PIXEL_SIZE, size // BOARD_PIXEL_SIZE)
+                static_board.fill(BLACK, brick_rect)
+                static_board.fill(wall_color, brick_rect.inflate(-2, -2))
+            self.static_boards[(background_color, wall_color)] = static_board
+        return static_board
+
+
+def create_renderer(grid, tile_rendering=False):
+    """
+    Return a renderer that draws the whole grid if it fits in a window, or follows the snake if not.
+
+    With tile_rendering, a grid that fits is drawn at one pixel per step and scaled up.
+    """
+    if grid.columns > MAX_WINDOW_TILES[0] or grid.rows > MAX_WINDOW_TILES[1]:
+        return ViewportRenderer(grid)
+    if tile_rendering:
+        return TileRenderer(grid)
+    return GridRenderer(grid)
+
+
+def pack_color(color):
+    """Pack an rgb color into a single int, as a pixel of a 32 bit surface."""
+    return color[0] << 16 | color[1] << 8 | color[2]
+
+
+def wrap_pieces(pieces, width, height):
+    """
+    Return the squares of a snake with a copy of each one hanging over the right or bottom edge of the grid
+    moved onto the opposite edge, straight after it, so the copy is drawn in the same order.
+    """
+    last_x = width - TILE_WIDTH_PIXELS
+    last_y = height - TILE_WIDTH_PIXELS
+    if all(x <= last_x and y <= last_y for x, y, _ in pieces):
+        return pieces
+    wrapped = []
+    for piece in pieces:
+        wrapped.append(piece)
+        x, y, color_index = piece
+        if x > last_x:
+            wrapped.append((x - width, y, color_index))
+        elif y > last_y:
+            wrapped.append((x, y - height, color_index))
+    return wrapped
+
+
+def make_piece_tiles(palette):
+    """A piece of the snake filled with each color of a palette."""
+    tiles = []
+    for color in palette:
+        tile = pygame.Surface((TILE_WIDTH_PIXELS, TILE_WIDTH_PIXELS)).convert()
+        tile.fill(color)
+        tiles.append(tile)
+    return tiles
+
+
+def make_brick_image(wall_color, size=TILE_WIDTH_PIXELS * 2):
+    """A brick of the wall, with a black border two pixels wide for every tile it spans."""
+    border = 2 * size // TILE_WIDTH_PIXELS
+    brick_image = pygame.Surface((size, size)).convert()
+    brick_image.fill(BLACK)
+    brick_image.fill(wall_color, brick_image.get_rect().inflate(-2 * border, -2 * border))
+    return brick_image
@@ -0,0 +1,158 @@
+import struct
+import sys
+import time
+
+from config import *
+from simulation import Simulation
+from wall import unpack_wall_map
+
+REPLAY_MAGIC = b"SNKR"
+REPLAY_VERSION = 5
+# magic, version, seed, columns, rows, elongation factor, snake color
+HEADER = struct.Struct("<4sBIHHIB")
+# bytes of the wall map's packed mask that follow, 0 for the wall around the edge of the grid
+WALL_MAP_SIZE = struct.Struct("<I")
+# tick, index of the key in ARROW_KEYS
+COMMAND = struct.Struct("<IB")
+COMMAND_COUNT = struct.Struct("<I")
+# ticks played, final state hash
+FOOTER = struct.Struct("<I16s")
+
+
+class ReplayRecorder:
+    """
+    Records the direction keys pressed during a game, so the game can be replayed exactly.
+
+    A game is fully determined by its seed, its settings and the keys pressed on each tick, so that is
+    all a recording holds, along with a hash of the final state to check a replay against. Each key
+    press takes five bytes. A game played on a map also holds the map's mask, at a bit per tile.
+
+    ...
+
+    Attributes
+    ----------
+    simulation : Simulation
+        the game being recorded
+    snake_color : function
+        the snake's color, one of SNAKE_COLORS
+    commands : list of tuple of int
+        the tick each key was pressed on and the key's index in ARROW_KEYS
+
+    Methods
+    -------
+    record(command)
+        note a key about to be passed to the simulation's next step
+    save(path)
+        write the recording and the simulation's current state hash to a file
+    """
+    def __init__(self, simulation, snake_color):
+        self.simulation = simulation
+        self.snake_color = snake_color
+        self.commands = []
+
+    def record(self, command):
+        self.commands.append((self.simulation.ticks, ARROW_KEYS.index(command)))
+
+    def save(self, path):
+        simulation = self.simulation
+        snake = simulation.grid.snake
+        with open(path, "wb") as replay_file:
+            replay_file.write(HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, simulation.seed, simulation.grid.columns,
+                                          simulation.grid.rows, snake.initial_elongation_factor,
+                                          SNAKE_COLORS.index(self.snake_color)))
+            packed_wall_map = simulation.wall_map.packed() if simulation.wall_map else b""
+            replay_file.write(WALL_MAP_SIZE.pack(len(packed_wall_map)))
+            replay_file.write(packed_wall_map)
+            replay_file.write(COMMAND_COUNT.pack(len(self.commands)))
+            for command in self.commands:
+                replay_file.write(COMMAND.pack(*command))
+            replay_file.write(FOOTER.pack(simulation.ticks, bytes.fromhex(simulation.state_hash())))
+
+
+class Replay:
+    """
+    A recorded game, loaded from a file written by ReplayRecorder.
+
+    ...
+
+    Attributes
+    ----------
+    seed : int
+        the seed the game was played with
+    grid_dimensions : tuple of int
+        the number of tiles across and down the grid
+    elongation_factor : int
+        how many pieces the snake grew by per apple at the start of the game
+    snake_color : function
+        the snake's color
+    wall_map : WallMap or None
+        the layout of the wall, if the game was played on a map
+    commands : list of tuple of int
+        the tick each key was pressed on and the key pressed
+    ticks : int
+        how many ticks the game was played for
+    state_hash : str
+        the state hash of the game when the recording was saved
+
+    Methods
+    -------
+    play()
+        replay the game without graphics as fast as possible, returns the finished simulation
+    """
+    def __init__(self, path):
+        with open(path, "rb") as replay_file:
+            data = replay_file.read()
+        magic, version, self.seed, columns, rows, self.elongation_factor, color_index = HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+            raise ValueError("{} is not a version {} replay".format(path, REPLAY_VERSION))
+        self.grid_dimensions = (columns, rows)
+        self.snake_color = SNAKE_COLORS[color_index]
+        offset = HEADER.size
+        wall_map_size, = WALL_MAP_SIZE.unpack_from(data, offset)
+        offset += WALL_MAP_SIZE.size
+        self.wall_map = None
+        if wall_map_size:
+            self.wall_map = unpack_wall_map(path, columns, rows, data[offset:offset + wall_map_size])
+        offset += wall_map_size
+        count, = COMMAND_COUNT.unpack_from(data, offset)
+        offset += COMMAND_COUNT.size
+        self.commands = [(tick, ARROW_KEYS[key]) for tick, key in COMMAND.iter_unpack(
+            data[offset:offset + count * COMMAND.size])]
+        offset += count * COMMAND.size
+        self.ticks, state_hash = FOOTER.unpack_from(data, offset)
+        self.state_hash = state_hash.hex()
+
+    def play(self):
+        simulation = Simulation(self.grid_dimensions, self.snake_color, self.elongation_factor, self.seed,
+                                self.wall_map)
+        step = simulation.step
+        commands = iter(self.commands)
+        next_tick, next_command = next(commands, (None, None))
+        for tick in range(self.ticks):
+            if tick == next_tick:
+                step(next_command)
+                next_tick, next_command = next(commands, (None, None))
+            else:
+                step()
+        return simulation
+
+
+def main(paths):
+    all_match = True
+    for path in paths:
+        replay = Replay(path)
+        start = time.perf_counter()
+        simulation = replay.play()
+        elapsed = time.perf_counter() - start
+        matches = simulation.state_hash() == replay.state_hash
+        all_match = all_match and matches
+        print("{}: {} ticks in {:.3f}s ({:,.0f} ticks/s), {}".format(
+            path, replay.ticks, elapsed, replay.ticks / max(elapsed, 1e-9), "ok" if matches else "STATE MISMATCH"))
+    return 0 if all_match else 1
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print("usage: python replay.py RECORDING [RECORDING ...]")
+        sys.exit(2)
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,335 @@
+import pygame
+from assets import assets
+from config import *
+from textcache import render_text
+
+
+class Scene:
+    """
+    One screen of the game, such as the start menu or the game being played.
+
+    The game shows one scene at a time, all under the one loop in Game.play(). Each time around the
+    loop the scene is handed the events that came in and the milliseconds that went by, and returns the
+    scene to show next. Pauses are counted down in those milliseconds rather than slept through, so the
+    window keeps answering events the whole time. A scene that has nothing new to show is waiting, and
+    the loop sleeps until an event comes in or the scene's time is up instead of going around again.
+
+    ...
+
+    Attributes
+    ----------
+    game : Game
+        the game the scene is shown in
+    frame_rate : int
+        the most times per second the loop goes around while the scene is shown, or 0 for no limit
+    time_left_ms : float or None
+        how long until the scene's pause is over, or None if it isn't pausing
+    needs_drawing : bool
+        whether the scene has changed since it was last drawn
+
+    Methods
+    -------
+    is_waiting()
+        whether the scene has nothing to show until an event comes in or its pause is over
+    wait_ms()
+        how long the loop may sleep waiting for an event
+    handle_events(events)
+        act on the events that came in
+    update(elapsed_ms)
+        move the scene on by elapsed_ms milliseconds, returns the scene to show next or None to end the game
+    draw(screen)
+        show what changed
+    """
+    def __init__(self, game):
+        self.game = game
+        self.frame_rate = 0
+        self.time_left_ms = None
+        self.needs_drawing = True
+
+    def is_waiting(self):
+        return not self.needs_drawing
+
+    def wait_ms(self):
+        if self.time_left_ms is None:
+            return MENU_REFRESH_MS
+        # pygame waits forever on a timeout of 0
+        return max(1, min(MENU_REFRESH_MS, int(self.time_left_ms + 1)))
+
+    def handle_events(self, events):
+        pass
+
+    def update(self, elapsed_ms):
+        if self.time_left_ms is not None:
+            self.time_left_ms -= elapsed_ms
+            if self.time_left_ms <= 0:
+                self.time_left_ms = None
+                return self._end_pause()
+        return self
+
+    def draw(self, screen):
+        if self.needs_drawing:
+            self.needs_drawing = False
+            self._draw(screen)
+            pygame.display.flip()
+
+    def _end_pause(self):
+        return self
+
+    def _draw(self, screen):
+        pass
+
+
+class MenuScene(Scene):
+    """The start menu's settings page, until the settings are locked in and the chime has played."""
+    def handle_events(self, events):
+        start_menu = self.game.start_menu
+        for event in events:
+            if event.type == KEYDOWN and not start_menu.is_submitted:
+                if start_menu.handle_keypress(event.key):
+                    self.needs_drawing = True
+                if start_menu.is_submitted:
+                    self.time_left_ms = SUBMIT_PAUSE_MS
+
+    def _end_pause(self):
+        self.game.start_game(self.game.start_menu.chosen_settings())
+        return DirectionsScene(self.game)
+
+    def _draw(self, screen):
+        self.game.start_menu.draw()
+
+
+class DirectionsScene(Scene):
+    """The game's directions, until a key is pressed."""
+    def __init__(self, game):
+        super().__init__(game)
+        self.is_done = False
+
+    def handle_events(self, events):
+        self.is_done = self.is_done or any(event.type == KEYDOWN for event in events)
+
+    def update(self, elapsed_ms):
+        if self.is_done:
+            # the window is resized for the grid, so the directions aren't drawn again
+            self.needs_drawing = False
+            self.game.show_grid()
+            return PlayingScene(self.game)
+        return self
+
+    def _draw(self, screen):
+        self.game.start_menu.draw_directions()
+
+
+class PlayingScene(Scene):
+    """
+    The game being played.
+
+    The game updates on a fixed timestep, as many times as the time since the last frame calls for, and
+    is only drawn once all those updates are done. Only the parts of the screen that changed are updated.
+
+    ...
+
+    Attributes
+    ----------
+    command : int or None
+        the last direction key pressed since the previous update
+    unsimulated_ms : float
+        the time that has gone by that the game hasn't been updated for yet
+    ticks : int
+        how many times the game was updated this frame
+    """
+    def __init__(self, game):
+        super().__init__(game)
+        self.frame_rate = MAX_FRAME_RATE
+        self.command = None
+        self.tick_ms = 1000 / game.clock_speed
+        self.unsimulated_ms = 0.0
+        self.ticks = 0
+        game.stats_banner.announce_level_change()
+        if game.profiler:
+            self._start_profiler()
+
+    def is_waiting(self):
+        return False
+
+    def handle_events(self, events):
+        for event in events:
+            if event.type == KEYDOWN and event.key in ARROW_KEYS:
+                self.command = event.key
+            elif event.type == KEYDOWN and event.key == K_F3 and self.game.profiler:
+                self.game.profiler.toggle_overlay()
+                self.game.grid_renderer.invalidate()
+
+    def update(self, elapsed_ms):
+        simulation = self.game.simulation
+        self.unsimulated_ms += elapsed_ms
+        self.ticks = 0
+        while self.unsimulated_ms >= self.tick_ms and self.ticks < MAX_TICKS_PER_FRAME and not simulation.is_over:
+            self._update()
+            self._checks()
+            self.unsimulated_ms -= self.tick_ms
+            self.ticks += 1
+            if simulation.leveled_up:
+                break
+        if self.ticks:
+            self.game.dropped_frames += self.ticks - 1
+            if simulation.leveled_up:
+                # the updates still owed are caught up on once the level has changed
+                return LevelTransitionScene(self.game, self)
+        if simulation.is_over:
+            self.game.save_replay()
+            return WonScene(self.game) if simulation.is_won else LostScene(self.game)
+        if self.unsimulated_ms >= self.tick_ms:
+            self.game.simulation_lag += (self.unsimulated_ms - self.unsimulated_ms % self.tick_ms) / 1000
+            self.unsimulated_ms %= self.tick_ms
+        return self
+
+    def draw(self, screen):
+        if self.ticks:
+            self._flip(self._draw())
+
+    def _update(self):
+        self._update_banner()
+        if self.command is not None:
+            self.game.recorder.record(self.command)
+        self.game.simulation.step(self.command)
+        self.command = None
+
+    def _update_banner(self):
+        self.game.stats_banner.update()
+
+    def _checks(self):
+        apple_eaten = self.game.simulation.apple_eaten
+        if apple_eaten:
+            self.game.apple_sounds[apple_eaten.color].play()
+            self.game.stats_banner.score = self.game.simulation.score
+
+    def _draw(self):
+        dirty_rects = self.game.grid_renderer.draw(self.game.screen)
+        dirty_rects += self.game.stats_banner.draw(self.game.screen)
+        return dirty_rects
+
+    def _flip(self, dirty_rects):
+        pygame.display.update(dirty_rects)
+
+    def _start_profiler(self):
+        profiler = self.game.profiler
+        self.handle_events = profiler.timed("input", self.handle_events)
+        self._update = profiler.timed("update", self._update)
+        # the banner is kept from game to game, so its update is timed here rather than wrapped in place
+        self._update_banner = profiler.timed("banner update", self._update_banner)
+        grid = self.game.grid
+        grid.update = profiler.timed("grid update", grid.update)
+        # the checks for apples and collisions run inside the simulation's step, so they're wrapped on the grid
+        grid.check_apple_eaten = profiler.timed("checks", grid.check_apple_eaten)
+        grid.check_snake_collision = profiler.timed("checks", grid.check_snake_collision)
+        self._draw = profiler.timed("draw", self._draw)
+        self._timed_flip = profiler.timed("flip", self._flip)
+        self._flip = self._profiled_flip
+
+    def _profiled_flip(self, dirty_rects):
+        grid = self.game.grid
+        if self.game.profiler.is_overlay_visible:
+            dirty_rects.append(self.game.profiler.draw_overlay(self.game.screen))
+        self._timed_flip(dirty_rects)
+        snake_length = len(grid.snake)
+        apple_count = len(grid.other_apples) + grid.red_apple.is_placed
+        wall_count = len(grid.brick_wall.bricks) + len(grid.brick_wall.tiles)
+        self.game.profiler.end_frame(snake_length, snake_length + apple_count + wall_count)
+
+
+class LevelTransitionScene(Scene):
+    """
+    The move from one level to the next.
+
+    The new level is announced and the banner changes to its color, then the game carries on in the
+    same frame, so the level changing takes no time out of the game.
+    """
+    def __init__(self, game, playing_scene):
+        super().__init__(game)
+        self.frame_rate = MAX_FRAME_RATE
+        self.playing_scene = playing_scene
+
+    def is_waiting(self):
+        return False
+
+    def handle_events(self, events):
+        self.playing_scene.handle_events(events)
+
+    def update(self, elapsed_ms):
+        stats_banner = self.game.stats_banner
+        stats_banner.level = self.game.simulation.level
+        stats_banner.score = self.game.simulation.score
+        stats_banner.announce_level_change()
+        stats_banner.change_color(self.game.simulation.palette[2])
+        return self.playing_scene.update(elapsed_ms)
+
+    def draw(self, screen):
+        self.playing_scene.draw(screen)
+
+
+class LostScene(Scene):
+    """The grid as the snake died on it, then the offer to play again, until the player answers."""
+    def __init__(self, game):
+        super().__init__(game)
+        assets.sound(LOSS_SOUND).play()
+        self.time_left_ms = LOSS_PAUSE_MS
+        self.needs_drawing = False
+        self.is_asking = False
+
+    def handle_events(self, events):
+        for event in events:
+            if self.is_asking and event.type == KEYDOWN and event.key in [K_y, K_n]:
+                self.game.play_again = event.key == K_y
+                self.is_asking = False
+
+    def update(self, elapsed_ms):
+        if self.game.play_again is not None:
+            return None
+        return super().update(elapsed_ms)
+
+    def _end_pause(self):
+        self.is_asking = True
+        self.needs_drawing = True
+        return self
+
+    def _draw(self, screen):
+        font_huge = assets.font(STANDARD_FONT, FONT_SIZE_HUGE)
+        font_large = assets.font(STANDARD_FONT, FONT_SIZE_LARGE)
+
+        you_lost_text = render_text(font_huge, "YOU LOST", DARK_GRAY)
+        you_lost_rect = you_lost_text.get_rect()
+        view = self.game.grid_renderer.rect
+        you_lost_rect.center = view.centerx, view.top + view.height * 0.45
+
+        play_again_text = render_text(font_large, "Play again? Y / N", DARK_GRAY)
+        play_again_rect = play_again_text.get_rect()
+        play_again_rect.center = view.centerx, view.top + view.height * 0.55
+
+        screen.blit(you_lost_text, you_lost_rect)
+        screen.blit(play_again_text, play_again_rect)
+
+
+class WonScene(Scene):
+    """The victory screen, until a key is pressed once the pause after winning is over."""
+    def __init__(self, game):
+        super().__init__(game)
+        assets.sound(VICTORY_SOUND).play()
+        self.time_left_ms = VICTORY_PAUSE_MS
+        self.is_done = False
+
+    def handle_events(self, events):
+        if self.time_left_ms is None:
+            self.is_done = self.is_done or any(event.type == KEYDOWN for event in events)
+
+    def update(self, elapsed_ms):
+        if self.is_done:
+            self.game.play_again = False
+            return None
+        return super().update(elapsed_ms)
+
+    def _draw(self, screen):
+        font_huge = assets.font(STANDARD_FONT, FONT_SIZE_HUGE)
+        text = render_text(font_huge, "YOU WON!", DARK_GRAY)
+        text_rect = text.get_rect()
+        text_rect.center = self.game.grid_renderer.rect.center
+        screen.blit(text, text_rect)
@@ -0,0 +1,140 @@
+import hashlib
+from array import array
+from config import *
+from grid import Grid
+from snake import Snake
+
+
+class Simulation:
+    """
+    A single game of snake, without any graphics or sounds.
+
+    Applies the rules for scoring, leveling up, winning, and losing to a grid. The windowed game drives
+    one of these and draws its grid, but it can also be stepped on its own as fast as the machine allows,
+    which is how games are simulated for balancing and bot testing.
+
+    ...
+
+    Every random choice in the game is drawn from the simulation's own random number generator, so two
+    simulations with the same seed, settings and key presses play out exactly the same.
+
+    ...
+
+    Attributes
+    ----------
+    seed : int
+        the seed of the game's random number generator
+    random : random.Random
+        where all of the game's random choices are drawn from
+    wall_map : WallMap or None
+        the layout of the wall, or None for the wall around the edge of the grid
+    grid : Grid
+        the board on which the game is played
+    score : int
+        points scored on the current level
+    level : int
+        the current level
+    ticks : int
+        number of updates the game has been stepped
+    palette : tuple of tuple
+        the rgb colors of the current level
+    color_palettes : tuple of tuple
+        tuples of rgb color values, cycled through as the player levels up
+    apple_eaten : Apple or None
+        the apple the snake ate during the last update
+    leveled_up : bool
+        whether the last update advanced the player to the next level
+    is_won : bool
+        whether the player has beaten the final level
+    is_lost : bool
+        whether the snake has run into a wall or itself
+    cause_of_death : str or None
+        "self" or "wall", depending on what the snake ran into
+
+    Methods
+    -------
+    step(command=None)
+        advance the game by a single update, optionally pressing a direction key first
+    state_hash()
+        a digest of everything that determines how the game plays out from here
+    """
+    def __init__(self, grid_dimensions, snake_color, elongation_factor, seed=None, wall_map=None):
+        self.seed = random.getrandbits(32) if seed is None else seed
+        self.random = random.Random(self.seed)
+        self.wall_map = wall_map
+        snake = Snake(snake_color, elongation_factor, self.random)
+        dimensions = (grid_dimensions[0] * TILE_WIDTH_PIXELS, grid_dimensions[1] * TILE_WIDTH_PIXELS)
+        self.grid = Grid(dimensions, GREEN_PALETTE, snake, self.random, wall_map)
+        self.score = 0
+        self.level = 1
+        self.ticks = 0
+        self.palette = GREEN_PALETTE
+        self.color_palettes = (
+            GREEN_PALETTE,
+            RED_PALETTE,
+            BLUE_PALETTE,
+            BROWN_PALETTE,
+            PURPLE_PALETTE,
+        )
+        self.apple_eaten = None
+        self.leveled_up = False
+        self.is_won = False
+        self.is_lost = False
+        self.cause_of_death = None
+
+    @property
+    def is_over(self):
+        return self.is_won or self.is_lost
+
+    def step(self, command=None):
+        if command is not None:
+            self.grid.snake.head.command_pending = command
+        self.ticks += 1
+        self.leveled_up = False
+        self.grid.update()
+        self.apple_eaten = self.grid.check_apple_eaten()
+        if self.apple_eaten:
+            self.score += 1
+            if self.score == POINTS_PER_LEVEL:
+                self._update_level()
+        if not self.is_won and self.grid.check_snake_collision():
+            self.is_lost = True
+            self.cause_of_death = "self" if self.grid.snake.head_hits_body() else "wall"
+
+    def state_hash(self):
+        snake = self.grid.snake
+        head = snake.head
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(array('q', [
+            self.ticks, self.level, self.score, self.is_won, self.is_lost,
+            head.moveX, head.moveY, head.command_pending or 0, snake.elongation_factor, snake.elongation_cycles_remaining,
+            snake.ticks_since_move, *snake.vacated_position,
+        ]).tobytes())
+        digest.update(array('i', [coordinate for position in snake.positions() for coordinate in position]).tobytes())
+        digest.update(snake.body_color_indices.tobytes())
+        digest.update(array('i', [channel for color in snake.palette for channel in color]).tobytes())
+        for apple in [self.grid.red_apple] + self.grid.other_apples.apples:
+            digest.update(array('i', [apple.x, apple.y, apple.is_placed, *apple.color]).tobytes())
+        return digest.hexdigest()
+
+    def _update_level(self):
+        if self.level == FINAL_LEVEL:
+            self.is_won = True
+            return
+        self.grid.level_up()
+        self.level += 1
+        self.score = 0
+        self.leveled_up = True
+
+        if self.level == FINAL_LEVEL:
+            self.grid.snake.change_color(YARN_COLOR)
+            self.palette = GREY_PALETTE
+        else:
+            self.palette = self.color_palettes[(self.level - 1) % len(self.color_palettes)]
+        self.grid.change_color(self.palette[0], self.palette[1])
+
+
+def elongation_factor(grid_dimensions, elongation_rate):
+    """Return how many pieces the snake grows per apple on a grid, scaled from a difficulty's elongation rate."""
+    reference_columns, reference_rows = ELONGATION_REFERENCE_GRID
+    return int(grid_dimensions[0] * grid_dimensions[1] / (reference_columns * reference_rows) * elongation_rate)
@@ -1,5 +1,7 @@
-import pygame
+from array import array
+from itertools import chain
 from config import *
+from tiles import CollisionGrid
 
 
 class Snake:
@@ -11,146 +13,330 @@ class Snake:
     This design choice was made because it causes the snake to partially fold onto itself when it turns.
     This produces a fluid flow of hues, almost like water.
 
+    Only the tiles the snake covers are kept track of. The snake moves a whole tile once every
+    TICKS_PER_MOVE updates, and is drawn as three squares per tile that slide along towards the tile ahead
+    over the updates in between, their hues blending from one tile's color into the next.
+
+    Every piece of the body moves into the spot the piece ahead of it just left, so the body is stored as
+    a circular buffer of positions rather than as one object per piece. Moving the snake pushes the head's
+    old position onto the front of the buffer and drops the tail off the back, whatever the snake's length.
+
+    Positions are kept modulo the size of the grid, so the snake wraps around to the opposite edge the
+    moment its head crosses one. The squares drawn are wrapped too; one hanging over the right or bottom
+    edge of the grid is left for the renderer to show on both sides.
+
     ...
 
     Attributes
     ----------
     color : function
         returns a random rgb hue tuple of it's function name; Ex: BLUE() returns random blue hues
+    random : random.Random
+        where the random hues of the snake's pieces are drawn from
+    palette : list of tuple of int
+        the rgb colors the snake is drawn in; the first is black, the rest are random hues of color from
+        darkest to lightest, so that neighbouring colors blend into each other
     head : HeadPiece
         the head of the snake
-    all_pieces : list of SnakePiece
-        all segments of the snake
-    body_pieces_only : list of SnakePiece
-        all segments of the snake except the head
+    body_length : int
+        the number of tiles behind the head
+    body_xs : array of int
+        circular buffer of the horizontal position of each body piece
+    body_ys : array of int
+        circular buffer of the vertical position of each body piece
+    body_color_indices : array of int
+        the index in palette of the color of each body piece, from the piece behind the head to the tail
+    body_collisions : CollisionGrid
+        the tiles covered by the body
+    vacated_position : tuple of int
+        the spot the tail moved off of when the snake last moved, or where the tail is if it stayed put
+    ticks_since_move : int
+        how many updates ago the snake last moved onto a new tile
     initial_elongation_factor : int
         before any level ups, how cycles the snake will elongate for when triggered to grow
     elongation_factor : int
         the current number of cycles the snake will elongate for when triggered to grow
     elongation_cycles_remaining : int
-        how many more cycle (pygame clock ticks) the snake will elongate for
+        how many more cycle (pygame clock ticks) the snake will elongate for; it grows a tile every
+        TICKS_PER_MOVE cycles
+    moves : int
+        how many times the snake has moved; the piece at index i was pushed on during move moves - i
 
     Methods
     -------
+    update()
+        advance the snake by one update, returns whether it moved onto a new tile
+    moves_on_next_update()
+        whether the next update moves the snake, and so takes the direction key pressed last
     spawn_snake_parts()
         add another segment onto the back of the snake
+    change_color(color)
+        draw the snake's pieces from now on in random hues of a different color
+    set_grid_size(columns, rows)
+        size the snake's collision tracking to the grid it moves on
     remove_half()
-        removes roughly half of the snake from the back end
+        removes roughly half of the snake from the back end, returns the positions removed
     level_up()
-        reset the snake back to just the head and increase its elongation factor
+        reset the snake back to just the head and increase its elongation factor, returns the positions removed
+    position(index)
+        the position of a piece, counting from the head
+    positions()
+        the position of every piece, from the head to the tail
+    body_positions()
+        the horizontal and vertical positions of the body pieces as two arrays, from the head to the tail
+    pieces()
+        the position and palette index of the color of every square drawn, from the head to the tail
+    tile_pieces(index)
+        the position and palette index of the color of the squares drawn for a single tile
+    head_hits_body()
+        whether the head has run into the rest of the snake
     """
-    def __init__(self, color, elongation_factor):
+    def __init__(self, color, elongation_factor, rng=random):
         self.color = color
+        self.random = rng
+        self.palette = self._make_palette(color)
         self.head = HeadPiece()
-        self.all_pieces = [self.head]
-        self.body_pieces_only = []
+        self.body_length = 0
+        self.body_xs = array('i', bytes(4 * INITIAL_BODY_CAPACITY))
+        self.body_ys = array('i', bytes(4 * INITIAL_BODY_CAPACITY))
+        self.body_color_indices = array('B')
+        self.body_collisions = CollisionGrid(COLUMNS_IN_GRID, ROWS_IN_GRID)
+        self.vacated_position = (0, 0)
+        self.ticks_since_move = TICKS_PER_MOVE - 1
         self.initial_elongation_factor = elongation_factor
         self.elongation_factor = elongation_factor
         self.elongation_cycles_remaining = 0
+        self.moves = 0
+        self._front = 0
+        self._grid_dimensions = GRID_DIMENSIONS
+
+    def __len__(self):
+        return self.body_length + 1
+
+    def set_grid_size(self, columns, rows):
+        self.body_collisions = CollisionGrid(columns, rows)
+        self._grid_dimensions = (columns * TILE_WIDTH_PIXELS, rows * TILE_WIDTH_PIXELS)
 
     def update(self):
-        non_new_snake_pieces = self.all_pieces.copy()
+        self.ticks_since_move = (self.ticks_since_move + 1) % TICKS_PER_MOVE
+        if self.ticks_since_move:
+            return False
+        head_x, head_y = self.head.x, self.head.y
+        # a growing snake's tail stays where it is, which is where the new tail ends up
+        self.vacated_position = self.position(self.body_length)
         if self.elongation_cycles_remaining:
-            self.elongation_cycles_remaining -= 1
+            self.elongation_cycles_remaining = max(0, self.elongation_cycles_remaining - TICKS_PER_MOVE)
             self.spawn_snake_part()
-        for piece in reversed(self.body_pieces_only):
-            piece.determine_next_position()
-        for piece in non_new_snake_pieces:
-            piece.move_to_next_position()
+        else:
+            if self.body_length:
+                self.body_collisions.remove(*self.vacated_position, TILE_WIDTH_PIXELS)
+            self.body_length -= 1  # a new spot is pushed on below, so only the tail is dropped
+        self._push_front(head_x, head_y)
+        if self.body_length:
+            self.body_collisions.add(head_x, head_y, TILE_WIDTH_PIXELS)
+        self.moves += 1
+        self.head.move_to_next_position(*self._grid_dimensions)
+        return True
+
+    def moves_on_next_update(self):
+        return self.ticks_since_move == TICKS_PER_MOVE - 1
 
     def spawn_snake_part(self):
-        if len(self.all_pieces) < 3:
-            color = BLACK
+        if len(self) < 2:
+            color_index = 0
         else:
-            color = self.color()
-        new_body_part = BodyPiece(previous_piece=self.all_pieces[-1], color=color)
-        self.all_pieces.append(new_body_part)
-        self.body_pieces_only.append(new_body_part)
+            color_index = self.random.randrange(1, len(self.palette))
+        self.body_color_indices.append(color_index)
+
+    def change_color(self, color):
+        self.color = color
+        self.palette = self._make_palette(color)
 
     def remove_half(self):
         self.elongation_cycles_remaining = 0
-        snake_body_len = len(self.body_pieces_only)
+        snake_body_len = self.body_length
         if not snake_body_len:
-            return
-        if snake_body_len <= self.elongation_factor:
-            del self.all_pieces[-snake_body_len:]
-            del self.body_pieces_only[-snake_body_len:]
+            return []
+        if snake_body_len * TICKS_PER_MOVE <= self.elongation_factor:
+            amount_of_snake_to_remove = snake_body_len
         else:
             half_snake_len = int(snake_body_len / 2)
             amount_of_snake_to_remove = int(snake_body_len - half_snake_len)
-            del self.all_pieces[-amount_of_snake_to_remove:]
-            del self.body_pieces_only[-amount_of_snake_to_remove:]
+        return self._remove_from_tail(amount_of_snake_to_remove)
 
     def level_up(self):
         self.elongation_cycles_remaining = 0
-        self.all_pieces = [self.head]
-        self.body_pieces_only = []
         self.elongation_factor += self.initial_elongation_factor
+        return self._remove_from_tail(self.body_length)
 
+    def position(self, index):
+        if index == 0:
+            return self.head.x, self.head.y
+        buffer_index = (self._front + index - 1) % len(self.body_xs)
+        return self.body_xs[buffer_index], self.body_ys[buffer_index]
 
-class SnakePiece:
-    def __init__(self):
-        self.image = pygame.Surface((TILE_WIDTH_PIXELS, TILE_WIDTH_PIXELS)).convert()
-        self.rect = self.image.get_rect()
+    def positions(self):
+        yield self.head.x, self.head.y
+        xs = self.body_xs
+        ys = self.body_ys
+        capacity = len(xs)
+        buffer_index = self._front
+        for _ in range(self.body_length):
+            yield xs[buffer_index], ys[buffer_index]
+            buffer_index += 1
+            if buffer_index == capacity:
+                buffer_index = 0
 
-    def draw(self, surface):
-        surface.blit(self.image, self.rect)
+    def body_positions(self):
+        start = self._front
+        end = start + self.body_length
+        capacity = len(self.body_xs)
+        if end <= capacity:
+            return self.body_xs[start:end], self.body_ys[start:end]
+        return (self.body_xs[start:] + self.body_xs[:end - capacity],
+                self.body_ys[start:] + self.body_ys[:end - capacity])
 
+    def pieces(self):
+        positions = self.positions()
+        x, y = next(positions)
+        for index, (next_x, next_y) in enumerate(chain(positions, (self.vacated_position,))):
+            yield from self._tile_pieces(index, x, y, next_x, next_y)
+            x, y = next_x, next_y
 
-class HeadPiece(SnakePiece):
-    def __init__(self):
-        super().__init__()
-        self.image.fill(BLACK)
-        self.rect.topleft = 0, 0
+    def tile_pieces(self, index):
+        x, y = self.position(index)
+        next_x, next_y = self.position(index + 1) if index < self.body_length else self.vacated_position
+        return self._tile_pieces(index, x, y, next_x, next_y)
+
+    def head_hits_body(self):
+        return self.body_collisions.is_hit(self.head.x, self.head.y)
+
+    def _tile_pieces(self, index, x, y, next_x, next_y):
+        """
+        The squares drawn for the tile at index, which slide from it towards the next tile along.
+
+        Squares are numbered from the head, which is square 0, and are spaced a step apart. The head is
+        drawn as many steps short of its tile as there are updates left until it moves again, and every
+        square after it follows in its track.
+        """
+        lag = TICKS_PER_MOVE - 1 - self.ticks_since_move
+        first_step = max(index * TICKS_PER_MOVE, lag)
+        end_step = min((index + 1) * TICKS_PER_MOVE, self.body_length * TICKS_PER_MOVE + lag + 1)
+        if first_step >= end_step:
+            return []
+        width, height = self._grid_dimensions
+        step_x = self._wrapped_distance(next_x - x, width) // TICKS_PER_MOVE
+        step_y = self._wrapped_distance(next_y - y, height) // TICKS_PER_MOVE
+        pieces = []
+        for step in range(first_step, end_step):
+            steps_back = step - index * TICKS_PER_MOVE
+            pieces.append(((x + steps_back * step_x) % width, (y + steps_back * step_y) % height,
+                           self._piece_color_index(step - lag)))
+        return pieces
+
+    def _piece_color_index(self, number):
+        """The palette index of square number, counting from the head, blended between its tile's color and the next."""
+        if not number:
+            return 0
+        color_indices = self.body_color_indices
+        index, blend = divmod(number - 1, TICKS_PER_MOVE)
+        index = min(index, len(color_indices) - 1)
+        color_index = color_indices[index]
+        if blend and index + 1 < len(color_indices) and color_index and color_indices[index + 1]:
+            color_index += (color_indices[index + 1] - color_index) * blend // TICKS_PER_MOVE
+        return color_index
+
+    @staticmethod
+    def _wrapped_distance(distance, grid_length):
+        """The distance between neighbouring tiles, counting the short way round if they are on opposite edges."""
+        if distance > TILE_WIDTH_PIXELS:
+            return distance - grid_length
+        if distance < -TILE_WIDTH_PIXELS:
+            return distance + grid_length
+        return distance
+
+    def _make_palette(self, color):
+        return [BLACK] + sorted((color(self.random) for _ in range(SNAKE_PALETTE_SIZE - 1)), key=sum)
+
+    def _push_front(self, x, y):
+        if self.body_length == len(self.body_xs):
+            self._grow_buffer()
+        self._front = (self._front - 1) % len(self.body_xs)
+        self.body_xs[self._front] = x
+        self.body_ys[self._front] = y
+        self.body_length += 1
+
+    def _grow_buffer(self):
+        capacity = len(self.body_xs)
+        unrolled = [(self._front + i) % capacity for i in range(self.body_length)]
+        self.body_xs = array('i', [self.body_xs[i] for i in unrolled]) + array('i', bytes(4 * capacity))
+        self.body_ys = array('i', [self.body_ys[i] for i in unrolled]) + array('i', bytes(4 * capacity))
+        self._front = 0
+
+    def _remove_from_tail(self, amount):
+        first_removed = self.body_length - amount + 1
+        removed_positions = [self.position(index) for index in range(first_removed, self.body_length + 1)]
+        for position in removed_positions:
+            self.body_collisions.remove(*position, TILE_WIDTH_PIXELS)
+        self.body_length -= amount
+        del self.body_color_indices[self.body_length:]
+        # the new tail is drawn still rather than sliding towards a piece that isn't there anymore
+        self.vacated_position = self.position(self.body_length)
+        return removed_positions
+
+
+class SnakePiece:
+    """
+    A single square segment of the snake.
+
+    Pieces are plain coordinates relative to the top left corner of the playing grid; drawing them is
+    left to the renderer.
+    """
+    __slots__ = ('x', 'y', 'moveX', 'moveY', 'color')
+    size = TILE_WIDTH_PIXELS
+
+    def __init__(self, color):
+        self.x = 0
+        self.y = 0
         self.moveX = 0
         self.moveY = 0
-        self.speed = PIXELS_TRAVERSED_PER_UPDATE
-        self.command_pending = None
+        self.color = color
 
     def move_to(self, x, y):
-        self.rect.topleft = x, y
+        self.x = x
+        self.y = y
+
+
+class HeadPiece(SnakePiece):
+    __slots__ = ('speed', 'command_pending')
+
+    def __init__(self):
+        super().__init__(BLACK)
+        self.speed = TILE_WIDTH_PIXELS
+        self.command_pending = None
 
-    def move_to_next_position(self):
+    def move_to_next_position(self, grid_width, grid_height):
         self._change_direction()
-        self.rect.move_ip(self.moveX, self.moveY)
+        self.x = (self.x + self.moveX) % grid_width
+        self.y = (self.y + self.moveY) % grid_height
 
     def _change_direction(self):
-        # First line ensures snake only executes directional change command along predefined grid pattern
-        if (self.rect.topleft[0] % TILE_WIDTH_PIXELS == 0) and ((self.rect.topleft[1] - 100) % TILE_WIDTH_PIXELS == 0):
-            if self.command_pending:
-                if not self.moveX:
-                    if self.command_pending in [K_a, K_LEFT]:
-                        self.moveY = 0
-                        self.moveX = -self.speed
-                        return
-                    elif self.command_pending in [K_d, K_RIGHT]:
-                        self.moveY = 0
-                        self.moveX = self.speed
-                        return
-                if not self.moveY:
-                    if self.command_pending in [K_s, K_DOWN]:
-                        self.moveX = 0
-                        self.moveY = self.speed
-                        return
-                    elif self.command_pending in [K_w, K_UP]:
-                        self.moveX = 0
-                        self.moveY = -self.speed
-                        return
-
-
-class BodyPiece(SnakePiece):
-    def __init__(self, previous_piece, color):
-        super().__init__()
-        self.previous_piece = previous_piece
-        self.image.fill(color)
-        self.rect = self.image.get_rect()
-        self.moveX = self.previous_piece.moveX
-        self.moveY = self.previous_piece.moveY
-        self.rect.topleft = self.previous_piece.rect.topleft
-
-    def determine_next_position(self):
-        self.moveX = self.previous_piece.moveX
-        self.moveY = self.previous_piece.moveY
-
-    def move_to_next_position(self):
-        self.rect.move_ip(self.moveX, self.moveY)
+        if self.command_pending:
+            if not self.moveX:
+                if self.command_pending in [K_a, K_LEFT]:
+                    self.moveY = 0
+                    self.moveX = -self.speed
+                    return
+                elif self.command_pending in [K_d, K_RIGHT]:
+                    self.moveY = 0
+                    self.moveX = self.speed
+                    return
+            if not self.moveY:
+                if self.command_pending in [K_s, K_DOWN]:
+                    self.moveX = 0
+                    self.moveY = self.speed
+                    return
+                elif self.command_pending in [K_w, K_UP]:
+                    self.moveX = 0
+                    self.moveY = -self.speed
+                    return
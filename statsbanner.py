@@ -1,5 +1,7 @@
 import pygame
+from assets import assets
 from config import *
+from textcache import render_text
 
 
 class StatsBanner:
@@ -33,12 +35,16 @@ class StatsBanner:
     -------
     change_color(color)
         change the color of the banner's background
+    reset(color)
+        go back to a score of 0 on level 1, with a background of the given color
     announce_level_change()
         play an audio file announcing the current level
     update()
-        update the score and level text
+        update the score and level text if either of them changed
     draw()
-        draw the banner to the screen
+        draw the banner to the screen if anything on it changed, returns the areas drawn
+    invalidate()
+        draw the banner on the next frame even if nothing on it changed
     """
     def __init__(self, grid_dimensions, color):
         self.dimensions = grid_dimensions[0], 100
@@ -47,34 +53,53 @@ class StatsBanner:
         self.background.fill(color)
         self.rect = self.background.get_rect()
         self.rect.topleft = 0, 0
-        self.font = pygame.font.Font(FONT_PATH + STANDARD_FONT, FONT_SIZE_SMALL)
+        self.font = assets.font(STANDARD_FONT, FONT_SIZE_SMALL)
         self.score_text = None
         self.level_text = None
         self.score_rect = None
         self.level_rect = None
         self.score = 0
         self.level = 1
+        self._rendered_stats = None
+        self._drawn_stats = None
 
     def change_color(self, color):
         self.color = color
         self.background.fill(self.color)
 
+    def reset(self, color):
+        self.score = 0
+        self.level = 1
+        self.change_color(color)
+        self.invalidate()
+
     def announce_level_change(self):
-        pygame.mixer.Sound(SOUND_PATH + GLOSS_SOUND)
-        pygame.mixer.Sound(SOUND_PATH + LEVEL_ANNOUNCEMENT_SOUNDS[self.level-1]).play()
+        assets.sound(LEVEL_ANNOUNCEMENT_SOUNDS[self.level-1]).play()
 
     def update(self):
+        stats = (self.score, self.level, self.color)
+        if stats == self._rendered_stats:
+            return
+        self._rendered_stats = stats
         score_text = f"SCORE:   {self.score:02d}"
         level_text = f"LEVEL:   {self.level:02d}"
-        self.score_text = self.font.render(score_text, True, WHITE, self.color)
-        self.level_text = self.font.render(level_text, True, WHITE, self.color)
+        self.score_text = render_text(self.font, score_text, WHITE, self.color)
+        self.level_text = render_text(self.font, level_text, WHITE, self.color)
         self.score_rect = self.score_text.get_rect()
         self.level_rect = self.level_text.get_rect()
         self.score_rect.center = (self.dimensions[0] * 0.25, self.dimensions[1] * 0.5)
         self.level_rect.center = (self.dimensions[0] * 0.75, self.dimensions[1] * 0.5)
 
+    def invalidate(self):
+        self._drawn_stats = None
+
     def draw(self, surface):
+        # the score may have changed since the text was last updated, so it's brought up to date first
+        self.update()
+        if self._rendered_stats == self._drawn_stats:
+            return []
+        self._drawn_stats = self._rendered_stats
         surface.blit(self.background, self.rect)
         surface.blit(self.score_text, self.score_rect)
         surface.blit(self.level_text, self.level_rect)
-
+        return [self.rect.copy()]
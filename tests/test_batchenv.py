@@ -0,0 +1,18 @@
+import numpy as np
+
+from batchenv import BatchEnvironment, INITIAL_APPLE_SLOTS, NO_TURN, GOLDEN_APPLE_TILE, POISON_APPLE_TILE
+
+NUMBER_OF_GAMES = 4
+
+
+def test_apples_keep_spawning_once_the_first_slots_are_taken():
+    environment = BatchEnvironment(NUMBER_OF_GAMES, (26, 26), 6, seed=0)
+    environment.other_apple_spawn_rates[:] = 1
+    environment.other_apple_despawn_rates[:] = 0
+    # the snakes stay still until they're first given a direction, so no game ends
+    for _ in range(INITIAL_APPLE_SLOTS * 3):
+        environment.step(np.full(NUMBER_OF_GAMES, NO_TURN))
+    apple_counts = (environment.apple_tiles >= 0).sum(axis=1)
+    assert (apple_counts == INITIAL_APPLE_SLOTS * 3).all()
+    boards = environment.observe().reshape(NUMBER_OF_GAMES, -1)
+    assert (np.isin(boards, [GOLDEN_APPLE_TILE, POISON_APPLE_TILE]).sum(axis=1) == apple_counts).all()
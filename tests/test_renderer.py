@@ -0,0 +1,83 @@
+import pygame
+import pytest
+
+from config import *
+from renderer import GridRenderer, TileRenderer, ViewportRenderer, pack_color
+from simulation import Simulation, elongation_factor
+from tournament import chase_apple
+
+GRID_DIMENSIONS = (26, 26)
+MAX_TICKS = 1500
+
+
+@pytest.fixture(scope="module", autouse=True)
+def display():
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    yield
+    pygame.display.quit()
+
+
+@pytest.mark.parametrize("seed", [3, 4])
+def test_drawing_changes_matches_redrawing_everything(seed):
+    simulation = Simulation(GRID_DIMENSIONS, BLUE_SPECTRUM, elongation_factor(GRID_DIMENSIONS, 1), seed)
+    incremental = GridRenderer(simulation.grid)
+    full = GridRenderer(simulation.grid)
+    size = incremental.rect.bottomright
+    incremental_surface = pygame.Surface(size)
+    full_surface = pygame.Surface(size)
+    while not simulation.is_over and simulation.ticks < MAX_TICKS:
+        simulation.step(chase_apple(simulation))
+        incremental.draw(incremental_surface)
+        full.invalidate()
+        full.draw(full_surface)
+        incremental_pixels = pygame.image.tostring(incremental_surface, "RGB")
+        assert incremental_pixels == pygame.image.tostring(full_surface, "RGB"), "tick {}".format(simulation.ticks)
+
+
+def test_viewport_matches_the_same_area_of_the_whole_grid():
+    simulation = Simulation((120, 100), BLUE_SPECTRUM, 40, 0)
+    grid = simulation.grid
+    # enough apples that most of them are out of view
+    grid.other_apple_spawn_rate = 0.5
+    viewport = ViewportRenderer(grid)
+    full = GridRenderer(grid)
+    viewport_surface = pygame.Surface(viewport.rect.bottomright)
+    full_surface = pygame.Surface(full.rect.bottomright)
+    while not simulation.is_over and simulation.ticks < MAX_TICKS:
+        simulation.step(chase_apple(simulation))
+        if simulation.ticks % 50:
+            continue
+        viewport.draw(viewport_surface)
+        full.invalidate()
+        full.draw(full_surface)
+        camera_on_screen = viewport.camera.move(0, full.rect.top)
+        viewport_pixels = pygame.image.tostring(viewport_surface.subsurface(viewport.rect), "RGB")
+        full_pixels = pygame.image.tostring(full_surface.subsurface(camera_on_screen), "RGB")
+        assert viewport_pixels == full_pixels, "tick {}".format(simulation.ticks)
+    assert len(grid.other_apples) > 100
+
+
+def test_tile_rendering_sets_each_pixel_once_to_the_last_sprite_over_it():
+    # a long snake folding onto itself, so plenty of pixels are covered by squares of different colors
+    simulation = Simulation(GRID_DIMENSIONS, BLUE_SPECTRUM, 40, 3)
+    while simulation.ticks < 400:
+        simulation.step(chase_apple(simulation))
+    assert len(simulation.grid.snake) > 50
+    renderer = TileRenderer(simulation.grid)
+    xs, ys, colors = renderer._sprite_pixels()
+    assert len(set(zip(xs.tolist(), ys.tolist()))) == len(xs)
+
+    # draw the sprites one square at a time, in the order the renderer is meant to draw them
+    grid = simulation.grid
+    snake_xs, snake_ys, snake_color_indices = renderer._snake_squares()
+    sprites = [(apple.x, apple.y, pack_color(apple.color)) for apple in grid.other_apples.apples + [grid.red_apple]]
+    sprites += zip(snake_xs.tolist(), snake_ys.tolist(), renderer._get_snake_colors()[snake_color_indices].tolist())
+    width, height = renderer.board.get_size()
+    steps = TILE_WIDTH_PIXELS // BOARD_PIXEL_SIZE
+    expected = {}
+    for x, y, color in sprites:
+        for step_y in range(steps):
+            for step_x in range(steps):
+                expected[((x // BOARD_PIXEL_SIZE + step_x) % width, (y // BOARD_PIXEL_SIZE + step_y) % height)] = color
+    assert dict(zip(zip(xs.tolist(), ys.tolist()), colors.tolist())) == expected
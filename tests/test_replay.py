@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+from config import *
+from replay import HEADER, REPLAY_VERSION, Replay, ReplayRecorder
+from simulation import Simulation
+from tournament import chase_apple
+from wall import load_wall_map
+
+MAX_TICKS = 3000
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+
+def record_game(seed, grid_dimensions, wall_map=None):
+    simulation = Simulation(grid_dimensions, PURPLE_SPECTRUM, 40, seed, wall_map)
+    recorder = ReplayRecorder(simulation, PURPLE_SPECTRUM)
+    while not simulation.is_over and simulation.ticks < MAX_TICKS:
+        command = chase_apple(simulation)
+        if command is not None:
+            recorder.record(command)
+        simulation.step(command)
+    return simulation, recorder
+
+
+@pytest.mark.parametrize("map_name", [None, "pillars.txt"])
+def test_a_saved_replay_plays_back_to_the_same_state(tmp_path, map_name):
+    wall_map = load_wall_map(os.path.join(ROOT, MAP_PATH, map_name)) if map_name else None
+    grid_dimensions = (wall_map.columns, wall_map.rows) if wall_map else (30, 24)
+    simulation, recorder = record_game(7, grid_dimensions, wall_map)
+    path = str(tmp_path / "game.replay")
+    recorder.save(path)
+    with open(path, "rb") as replay_file:
+        assert HEADER.unpack_from(replay_file.read())[1] == REPLAY_VERSION == 5
+
+    replay = Replay(path)
+    assert (replay.seed, replay.grid_dimensions, replay.ticks) == (7, grid_dimensions, simulation.ticks)
+    assert replay.snake_color is PURPLE_SPECTRUM
+    assert len(replay.commands) == len(recorder.commands) > 0
+    if wall_map:
+        assert replay.wall_map.mask == wall_map.mask
+    else:
+        assert replay.wall_map is None
+    assert replay.play().state_hash() == replay.state_hash == simulation.state_hash()
+
+
+def test_a_replay_missing_a_turn_ends_up_somewhere_else(tmp_path):
+    simulation, recorder = record_game(7, (30, 24))
+    commands = recorder.commands
+    # the policy presses a key every move, mostly the way the snake is already going
+    first_turn = next(index for index in range(1, len(commands)) if commands[index][1] != commands[index - 1][1])
+    del commands[first_turn]
+    path = str(tmp_path / "game.replay")
+    recorder.save(path)
+    replay = Replay(path)
+    assert replay.play().state_hash() != replay.state_hash
@@ -0,0 +1,55 @@
+import os
+
+import pygame
+import pytest
+
+from config import *
+from profiler import FrameProfiler
+from scenes import PlayingScene
+from statsbanner import StatsBanner
+from tournament import chase_apple
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+SETTINGS = (40, BLUE_SPECTRUM, 6, (26, 26))
+
+
+@pytest.fixture
+def game(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    pygame.init()
+    import main
+    game = main.Game()
+    game.start_game(SETTINGS)
+    game.show_grid()
+    yield game
+    pygame.quit()
+
+
+def test_banner_shows_the_score_as_soon_as_an_apple_is_eaten(game):
+    scene = PlayingScene(game)
+    simulation = game.simulation
+    while not simulation.apple_eaten:
+        assert not simulation.is_over
+        scene.command = chase_apple(simulation)
+        scene.update(scene.tick_ms)
+        scene.draw(game.screen)
+
+    fresh_banner = StatsBanner(game.grid_renderer.rect.size, game.stats_banner.color)
+    fresh_banner.score = simulation.score
+    expected = pygame.Surface(game.screen.get_size())
+    fresh_banner.draw(expected)
+    banner_area = game.stats_banner.rect
+    banner_pixels = pygame.image.tostring(game.screen.subsurface(banner_area), "RGB")
+    assert banner_pixels == pygame.image.tostring(expected.subsurface(banner_area), "RGB")
+
+
+def test_profiler_times_the_checks_for_apples_and_collisions(game):
+    game.profiler = FrameProfiler()
+    scene = PlayingScene(game)
+    for _ in range(30):
+        scene.update(scene.tick_ms)
+        scene.draw(game.screen)
+    profiler = game.profiler
+    assert sum(profiler.calls["update"]) == 30
+    # an apple check and a collision check on every update
+    assert sum(profiler.calls["checks"]) == 60
@@ -0,0 +1,47 @@
+import random
+from collections import Counter
+
+from config import *
+from tiles import FreeTileIndex
+
+COLUMNS, ROWS = 7, 5
+
+
+def covered_tiles(x, y, size):
+    """The tiles under a square sprite, worked out the slow way, wrapping round the edges of the grid."""
+    return [(row % ROWS) * COLUMNS + column % COLUMNS
+            for row in range(y // TILE_WIDTH_PIXELS, (y + size - 1) // TILE_WIDTH_PIXELS + 1)
+            for column in range(x // TILE_WIDTH_PIXELS, (x + size - 1) // TILE_WIDTH_PIXELS + 1)]
+
+
+def test_free_tiles_match_a_count_of_what_covers_each_tile():
+    rng = random.Random(2)
+    free_tiles = FreeTileIndex(COLUMNS, ROWS, rng)
+    counts = Counter()
+    placed = []
+    for _ in range(5000):
+        if placed and rng.random() < 0.5:
+            x, y, size = placed.pop(rng.randrange(len(placed)))
+            free_tiles.vacate(x, y, size)
+            counts.subtract(covered_tiles(x, y, size))
+        else:
+            size = rng.choice([TILE_WIDTH_PIXELS, 2 * TILE_WIDTH_PIXELS])
+            # sprites on whole tiles, as apples and the snake are, and bricks hanging off the edges
+            step = TILE_WIDTH_PIXELS if rng.random() < 0.8 else 1
+            x = rng.randrange(0, COLUMNS * TILE_WIDTH_PIXELS, step)
+            y = rng.randrange(0, ROWS * TILE_WIDTH_PIXELS, step)
+            free_tiles.occupy(x, y, size)
+            counts.update(covered_tiles(x, y, size))
+            placed.append((x, y, size))
+
+        expected_free = {tile for tile in range(COLUMNS * ROWS) if counts[tile] == 0}
+        assert set(free_tiles.free_tiles) == expected_free
+        assert len(free_tiles.free_tiles) == len(expected_free)
+        assert all(free_tiles.free_tiles[free_tiles.free_positions[tile]] == tile for tile in expected_free)
+        assert all(free_tiles.free_positions[tile] == -1 for tile in set(range(COLUMNS * ROWS)) - expected_free)
+        position = free_tiles.random_free_position()
+        if expected_free:
+            x, y = position
+            assert (y // TILE_WIDTH_PIXELS) * COLUMNS + x // TILE_WIDTH_PIXELS in expected_free
+        else:
+            assert position is None
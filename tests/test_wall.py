@@ -0,0 +1,12 @@
+import pytest
+
+from wall import load_wall_map
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n"])
+def test_map_files_load_with_either_line_ending(tmp_path, newline):
+    path = tmp_path / "map.txt"
+    path.write_bytes(newline.join(["; a comment", "####", "#..#", "####", ""]).encode())
+    wall_map = load_wall_map(str(path))
+    assert (wall_map.columns, wall_map.rows) == (4, 3)
+    assert list(wall_map.mask) == [1, 1, 1, 1, 1, 0, 0, 1, 1, 1, 1, 1]
@@ -0,0 +1,71 @@
+from collections import OrderedDict
+from config import *
+
+
+class TextCache:
+    """
+    Keeps rendered text around so the same label is never rendered twice.
+
+    Surfaces are keyed by the font, text, and colors they were rendered with. Once the surfaces held
+    add up to more than the memory budget, the least recently used ones are let go. The surfaces handed
+    out are shared, so they must not be drawn on.
+
+    ...
+
+    Attributes
+    ----------
+    max_bytes : int
+        the most memory the rendered surfaces may take up
+    bytes_used : int
+        the memory the rendered surfaces currently take up
+    hits : int
+        how many renders were answered from the cache
+    misses : int
+        how many renders had to be done by the font
+
+    Methods
+    -------
+    render(font, text, color, background=None)
+        the same as font.render(text, True, color, background), but cached
+    clear()
+        let go of every rendered surface
+    """
+    def __init__(self, max_bytes=TEXT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self._surfaces = OrderedDict()
+
+    def render(self, font, text, color, background=None):
+        key = (font, text, color, background)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, True, color, background)
+        self._surfaces[key] = surface
+        self.bytes_used += _surface_bytes(surface)
+        while self.bytes_used > self.max_bytes and len(self._surfaces) > 1:
+            _, evicted_surface = self._surfaces.popitem(last=False)
+            self.bytes_used -= _surface_bytes(evicted_surface)
+        return surface
+
+    def clear(self):
+        self._surfaces.clear()
+        self.bytes_used = 0
+
+
+def _surface_bytes(surface):
+    return surface.get_pitch() * surface.get_height()
+
+
+text_cache = TextCache()
+
+
+def render_text(font, text, color, background=None):
+    """Render text with the cache shared by the whole game."""
+    return text_cache.render(font, text, color, background)
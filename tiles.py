@@ -0,0 +1,258 @@
+from array import array
+from config import *
+
+
+class FreeTileIndex:
+    """
+    Keeps track of which tiles of the grid are not covered by anything.
+
+    Every tile keeps a count of the sprites covering it. Tiles with a count of zero are kept in a list
+    so that a free tile can be picked at random in a single step. A tile leaves the list by being swapped
+    with the last tile in it, so neither covering nor uncovering a tile ever shifts the list.
+
+    ...
+
+    Attributes
+    ----------
+    columns : int
+        the number of tiles across the grid
+    rows : int
+        the number of tiles down the grid
+    random : random.Random
+        where random free tiles are drawn from
+    occupancy : array of int
+        how many sprites cover each tile, indexed by row * columns + column
+    free_tiles : list of int
+        the index of every tile that nothing covers, in no particular order
+    free_positions : array of int
+        where each tile sits in free_tiles, or -1 if the tile is covered
+
+    Methods
+    -------
+    occupy(x, y, size)
+        mark the tiles under a square sprite as covered
+    vacate(x, y, size)
+        undo a previous call to occupy
+    random_free_position()
+        return the top left pixel of a random uncovered tile, or None if the grid is full
+    """
+    def __init__(self, columns, rows, rng=random):
+        self.columns = columns
+        self.rows = rows
+        self.random = rng
+        self.occupancy = array('i', bytes(4 * columns * rows))
+        self.free_tiles = list(range(columns * rows))
+        self.free_positions = array('i', self.free_tiles)
+
+    def occupy(self, x, y, size):
+        occupancy = self.occupancy
+        for tile in self._tiles_under(x, y, size):
+            occupancy[tile] += 1
+            if occupancy[tile] == 1:
+                self._remove_free_tile(tile)
+
+    def vacate(self, x, y, size):
+        occupancy = self.occupancy
+        for tile in self._tiles_under(x, y, size):
+            occupancy[tile] -= 1
+            if occupancy[tile] == 0:
+                self.free_positions[tile] = len(self.free_tiles)
+                self.free_tiles.append(tile)
+
+    def random_free_position(self):
+        if not self.free_tiles:
+            return None
+        tile = self.free_tiles[self.random.randrange(len(self.free_tiles))]
+        return (tile % self.columns) * TILE_WIDTH_PIXELS, (tile // self.columns) * TILE_WIDTH_PIXELS
+
+    def _remove_free_tile(self, tile):
+        position = self.free_positions[tile]
+        last_tile = self.free_tiles.pop()
+        if last_tile != tile:
+            self.free_tiles[position] = last_tile
+            self.free_positions[last_tile] = position
+        self.free_positions[tile] = -1
+
+    def _tiles_under(self, x, y, size):
+        if size == TILE_WIDTH_PIXELS and not x % TILE_WIDTH_PIXELS and not y % TILE_WIDTH_PIXELS:
+            return ((y // TILE_WIDTH_PIXELS) % self.rows * self.columns + (x // TILE_WIDTH_PIXELS) % self.columns,)
+        # sprites hanging off one edge of the grid cover the tiles on the opposite edge
+        first_column = x // TILE_WIDTH_PIXELS
+        last_column = (x + size - 1) // TILE_WIDTH_PIXELS
+        first_row = y // TILE_WIDTH_PIXELS
+        last_row = (y + size - 1) // TILE_WIDTH_PIXELS
+        return [(row % self.rows) * self.columns + column % self.columns
+                for row in range(first_row, last_row + 1)
+                for column in range(first_column, last_column + 1)]
+
+
+class CollisionGrid:
+    """
+    Counts, for every tile of the grid, how many squares cover it.
+
+    The snake moves a whole tile at a time, so its head only ever covers a single tile, and finding out
+    whether it hits anything is a single lookup, however many squares have been added.
+
+    ...
+
+    Attributes
+    ----------
+    columns : int
+        the number of tiles across the grid
+    rows : int
+        the number of tiles down the grid
+    counts : array of int
+        how many squares cover each tile, indexed by row * columns + column
+
+    Methods
+    -------
+    add(x, y, size)
+        add a square sprite
+    remove(x, y, size)
+        undo a previous call to add
+    is_hit(x, y)
+        whether the tile at x, y is covered by any square that was added
+    """
+    def __init__(self, columns, rows):
+        self.columns = columns
+        self.rows = rows
+        self.counts = array('H', bytes(2 * columns * rows))
+
+    def add(self, x, y, size):
+        self._change(x, y, size, 1)
+
+    def remove(self, x, y, size):
+        self._change(x, y, size, -1)
+
+    def is_hit(self, x, y):
+        return self.counts[(y // TILE_WIDTH_PIXELS) % self.rows * self.columns +
+                           (x // TILE_WIDTH_PIXELS) % self.columns] > 0
+
+    def _change(self, x, y, size, amount):
+        counts = self.counts
+        columns = [column % self.columns
+                   for column in range(x // TILE_WIDTH_PIXELS, (x + size - 1) // TILE_WIDTH_PIXELS + 1)]
+        for row in range(y // TILE_WIDTH_PIXELS, (y + size - 1) // TILE_WIDTH_PIXELS + 1):
+            row_start = row % self.rows * self.columns
+            for column in columns:
+                counts[row_start + column] += amount
+
+
+class AppleIndex:
+    """
+    Keeps track of the apples on the grid by the tile each one sits on.
+
+    Finding the apple on a tile is a single dictionary lookup. The apples are also kept in a list so that
+    one can be picked at random in a single step, and like the free tiles, an apple leaves the list by
+    being swapped with the last apple in it, so adding or removing an apple never shifts the list. They
+    are filed into chunks of the grid as well, so the ones in an area can be found without looking at
+    the rest.
+
+    ...
+
+    Attributes
+    ----------
+    columns : int
+        the number of tiles across the grid
+    apples : list of Apple
+        every apple in the index, in no particular order
+    slots : dict
+        where the apple on each tile sits in apples, keyed by row * columns + column
+    chunks : ChunkIndex
+        the apples, filed by the chunk of the grid they're in
+
+    Methods
+    -------
+    add(apple)
+        file an apple under the tile it sits on
+    remove(apple)
+        undo a previous call to add
+    at(x, y)
+        the apple on the tile at x, y, or None if there isn't one
+    apples_in(rect)
+        the apples in every chunk that overlaps rect
+    """
+    def __init__(self, columns):
+        self.columns = columns
+        self.apples = []
+        self.slots = {}
+        self.chunks = ChunkIndex(VIEWPORT_CHUNK_TILES * TILE_WIDTH_PIXELS)
+
+    def __len__(self):
+        return len(self.apples)
+
+    def __iter__(self):
+        return iter(self.apples)
+
+    def add(self, apple):
+        self.slots[self._tile(apple.x, apple.y)] = len(self.apples)
+        self.apples.append(apple)
+        self.chunks.add(apple.x, apple.y, apple)
+
+    def remove(self, apple):
+        slot = self.slots.pop(self._tile(apple.x, apple.y))
+        last_apple = self.apples.pop()
+        if last_apple is not apple:
+            self.apples[slot] = last_apple
+            self.slots[self._tile(last_apple.x, last_apple.y)] = slot
+        self.chunks.remove(apple.x, apple.y, apple)
+
+    def at(self, x, y):
+        slot = self.slots.get(self._tile(x, y))
+        return None if slot is None else self.apples[slot]
+
+    def apples_in(self, rect):
+        return self.chunks.items_in(rect)
+
+    def _tile(self, x, y):
+        return (y // TILE_WIDTH_PIXELS) * self.columns + x // TILE_WIDTH_PIXELS
+
+
+class ChunkIndex:
+    """
+    Sorts items placed on the grid into square chunks, so the items in an area can be found without
+    looking at any of the others.
+
+    ...
+
+    Attributes
+    ----------
+    chunk_size : int
+        the width of a chunk in pixels
+    chunks : dict
+        the set of items whose position falls in each chunk, keyed by the chunk's column and row
+
+    Methods
+    -------
+    add(x, y, item)
+        file an item under the chunk containing x, y
+    remove(x, y, item)
+        undo a previous call to add
+    items_in(rect)
+        the items filed under every chunk that overlaps rect
+    """
+    def __init__(self, chunk_size):
+        self.chunk_size = chunk_size
+        self.chunks = {}
+
+    def add(self, x, y, item):
+        key = (x // self.chunk_size, y // self.chunk_size)
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            chunk = self.chunks[key] = set()
+        chunk.add(item)
+
+    def remove(self, x, y, item):
+        key = (x // self.chunk_size, y // self.chunk_size)
+        chunk = self.chunks[key]
+        chunk.discard(item)
+        if not chunk:
+            del self.chunks[key]
+
+    def items_in(self, rect):
+        chunks = self.chunks
+        for row in range(rect.top // self.chunk_size, (rect.bottom - 1) // self.chunk_size + 1):
+            for column in range(rect.left // self.chunk_size, (rect.right - 1) // self.chunk_size + 1):
+                chunk = chunks.get((column, row))
+                if chunk:
+                    yield from chunk
@@ -0,0 +1,148 @@
+import argparse
+import importlib
+import json
+import multiprocessing
+import time
+
+from config import *
+from simulation import Simulation, elongation_factor
+
+DEFAULT_POLICY = "tournament:chase_apple"
+DEFAULT_MAX_TICKS = 200000
+DIRECTION_STEPS = {K_LEFT: (-1, 0), K_RIGHT: (1, 0), K_UP: (0, -1), K_DOWN: (0, 1)}
+
+_policy = None
+_max_ticks = None
+
+
+def chase_apple(simulation):
+    """
+    Steer the snake straight at the red apple, avoiding any tile the snake already covers.
+
+    A policy is called with the simulation before every update and returns a direction key to press,
+    or None to keep going the way the snake is headed.
+    """
+    grid = simulation.grid
+    head = grid.snake.head
+    if not grid.snake.moves_on_next_update():
+        return None
+    column, row = head.x // TILE_WIDTH_PIXELS, head.y // TILE_WIDTH_PIXELS
+    apple_column, apple_row = grid.red_apple.x // TILE_WIDTH_PIXELS, grid.red_apple.y // TILE_WIDTH_PIXELS
+    choices = []
+    for key, (step_x, step_y) in DIRECTION_STEPS.items():
+        if step_x * head.moveX < 0 or step_y * head.moveY < 0:
+            continue
+        next_column = (column + step_x) % grid.columns
+        next_row = (row + step_y) % grid.rows
+        next_tile = next_row * grid.columns + next_column
+        is_apple = (next_column, next_row) == (apple_column, apple_row)
+        if grid.free_tiles.occupancy[next_tile] and not is_apple:
+            continue
+        distance = abs(apple_column - next_column) + abs(apple_row - next_row)
+        choices.append((distance, key))
+    if not choices:
+        return None
+    return min(choices)[1]
+
+
+def load_policy(name):
+    """Import a policy given as "module:function"."""
+    module_name, _, function_name = name.partition(":")
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def play_game(seed, difficulty, grid_dimensions, policy, max_ticks):
+    """Play one headless game to the end and return how it went."""
+    name, game_speed, elongation_rate = difficulty
+    simulation = Simulation(grid_dimensions, BLUE_SPECTRUM, elongation_factor(grid_dimensions, elongation_rate), seed)
+    while not simulation.is_over and simulation.ticks < max_ticks:
+        simulation.step(policy(simulation))
+    if simulation.is_won:
+        outcome = "won"
+    elif simulation.is_lost:
+        outcome = simulation.cause_of_death
+    else:
+        outcome = "timeout"
+    return {
+        "seed": seed,
+        "difficulty": name,
+        "grid": "{}x{}".format(*grid_dimensions),
+        "level": simulation.level,
+        "score": simulation.score,
+        "points": (simulation.level - 1) * POINTS_PER_LEVEL + simulation.score,
+        "ticks": simulation.ticks,
+        "outcome": outcome,
+    }
+
+
+def summarize(results):
+    """Aggregate game results by difficulty and grid size."""
+    groups = {}
+    for result in results:
+        groups.setdefault((result["difficulty"], result["grid"]), []).append(result)
+    summaries = []
+    for (difficulty, grid), games in groups.items():
+        outcomes = {}
+        for game in games:
+            outcomes[game["outcome"]] = outcomes.get(game["outcome"], 0) + 1
+        summaries.append({
+            "difficulty": difficulty,
+            "grid": grid,
+            "games": len(games),
+            "mean_level": sum(game["level"] for game in games) / len(games),
+            "max_level": max(game["level"] for game in games),
+            "mean_points": sum(game["points"] for game in games) / len(games),
+            "mean_ticks": sum(game["ticks"] for game in games) / len(games),
+            "outcomes": outcomes,
+        })
+    return summaries
+
+
+def _start_worker(policy_name, max_ticks):
+    global _policy, _max_ticks
+    _policy = load_policy(policy_name)
+    _max_ticks = max_ticks
+
+
+def _play_match(match):
+    seed, difficulty, grid_dimensions = match
+    return play_game(seed, difficulty, grid_dimensions, _policy, _max_ticks)
+
+
+def main():
+    difficulties = {preset[0]: preset for preset in DIFFICULTY_PRESETS}
+    grids = {"{}x{}".format(*dimensions): dimensions for dimensions in GRID_SIZE_PRESETS}
+    parser = argparse.ArgumentParser(description="Play many seeded headless games across a process pool.")
+    parser.add_argument("--games", type=int, default=100, help="games played per difficulty and grid size")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game, the rest count up from it")
+    parser.add_argument("--difficulty", nargs="+", choices=list(difficulties), default=[DIFFICULTY_PRESETS[0][0]])
+    parser.add_argument("--grid", nargs="+", choices=list(grids), default=["{}x{}".format(*GRID_SIZE_PRESETS[0])])
+    parser.add_argument("--policy", default=DEFAULT_POLICY, help="policy to play with, as module:function")
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--max-ticks", type=int, default=DEFAULT_MAX_TICKS, help="updates before a game is called")
+    parser.add_argument("--output", default="tournament.json", help="where to write the summary")
+    args = parser.parse_args()
+
+    matches = [(args.seed + game, difficulties[difficulty], grids[grid])
+               for difficulty in args.difficulty
+               for grid in args.grid
+               for game in range(args.games)]
+    start = time.perf_counter()
+    with multiprocessing.Pool(args.workers, _start_worker, (args.policy, args.max_ticks)) as pool:
+        results = pool.map(_play_match, matches, chunksize=max(1, len(matches) // (args.workers * 8)))
+    elapsed = time.perf_counter() - start
+
+    summaries = summarize(results)
+    with open(args.output, "w") as summary_file:
+        json.dump({"policy": args.policy, "max_ticks": args.max_ticks, "summaries": summaries, "games": results},
+                  summary_file, indent=2)
+    total_ticks = sum(result["ticks"] for result in results)
+    for summary in summaries:
+        print("{difficulty:>7} {grid:>6}  games {games:>5}  mean level {mean_level:5.2f}  max level {max_level:>2}"
+              "  mean ticks {mean_ticks:9.0f}  {outcomes}".format(**summary))
+    print("{} games, {} ticks in {:.1f}s ({:,.0f} ticks/s) on {} workers".format(
+        len(results), total_ticks, elapsed, total_ticks / elapsed, args.workers))
+
+
+if __name__ == '__main__':
+    main()
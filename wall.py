@@ -1,4 +1,3 @@
-import pygame
 from config import *
 
 
@@ -9,6 +8,11 @@ class BrickWall():
     There's a small gap in each wall for the snake to pass through.
     The game is over if the snake touches any part of the wall.
 
+    Instead of the perimeter, the wall can be laid out by a WallMap, with any number of obstacles inside
+    the grid. Either way, every tile the wall covers is compiled into a mask with a flag per tile, so
+    whether the snake hits the wall is a single lookup. Brick objects are only made for the perimeter,
+    whose bricks are two tiles wide; a map's wall is kept as just the mask and the tiles it covers.
+
     ...
 
     Attributes
@@ -18,20 +22,40 @@ class BrickWall():
     color : tuple
         rgb color value
     bricks : list of Brick
-        all of the bricks that make up the wall
+        the bricks of the perimeter wall, empty if the wall is laid out by a map
+    tiles : list of tuple of int
+        the top left corner of every tile of a map's wall
+    mask : bytearray
+        for every tile, indexed by row * columns + column, whether the wall covers it
 
     Methods
     ------
     change_color(color)
         change the color of all bricks in the wall
-    draw(surface)
-        Draw the wall to the screen
+    is_hit_at(x, y)
+        whether a snake piece at x, y touches the wall
+    blocks()
+        the position and size of every square of wall to draw, bricks first
     """
-    def __init__(self, grid_dimensions, color):
+    def __init__(self, grid_dimensions, color, wall_map=None):
         self.grid_dimensions = grid_dimensions
         self.color = color
         self.bricks = []
-        self._place_bricks()
+        self.tiles = []
+        self._columns = grid_dimensions[0] // TILE_WIDTH_PIXELS
+        self._rows = grid_dimensions[1] // TILE_WIDTH_PIXELS
+        if wall_map is None:
+            self._place_bricks()
+            self.mask = bytearray(self._columns * self._rows)
+            for brick in self.bricks:
+                self._cover(brick.x, brick.y, brick.size)
+        else:
+            if (wall_map.columns, wall_map.rows) != (self._columns, self._rows):
+                raise ValueError("a {}x{} map doesn't fit a {}x{} grid".format(
+                    wall_map.columns, wall_map.rows, self._columns, self._rows))
+            self.mask = bytearray(wall_map.mask)
+            self.tiles = [((tile % self._columns) * TILE_WIDTH_PIXELS, (tile // self._columns) * TILE_WIDTH_PIXELS)
+                          for tile, is_wall in enumerate(self.mask) if is_wall]
 
     def _place_bricks(self):
         """Places the bricks that will make up the wall along the perimeter of the playing grid."""
@@ -40,15 +64,15 @@ class BrickWall():
 
         # build top and right walls
         x_position = 0
-        y_position = BANNER_DIMENSIONS[1]
-        top_wall = [Brick(self.color) for _ in range(bricks_per_horizontal_wall)]
-        right_wall = [Brick(self.color) for _ in range(bricks_per_vertical_wall)]
+        y_position = 0
+        top_wall = [Brick() for _ in range(bricks_per_horizontal_wall)]
+        right_wall = [Brick() for _ in range(bricks_per_vertical_wall)]
         for brick in top_wall:
-            brick.rect.move_ip(x_position, y_position)
+            brick.move_to(x_position, y_position)
             x_position += TILE_WIDTH_PIXELS * 2
         x_position -= TILE_WIDTH_PIXELS * 2
         for brick in right_wall:
-            brick.rect.move_ip(x_position, y_position)
+            brick.move_to(x_position, y_position)
             y_position += TILE_WIDTH_PIXELS * 2
 
         # if even number of bricks in wall, create gap size that is odd number to keep wall symmetrical
@@ -67,41 +91,107 @@ class BrickWall():
         right_wall = right_wall[:r] + right_wall[r + vertical_gap_len:]
 
         # mirror top and right walls
-        # copy.deepcopy doesn't work on rect objects
-        left_wall = [Brick(self.color) for _ in range(bricks_per_vertical_wall)]
-        bottom_wall = [Brick(self.color) for _ in range(bricks_per_horizontal_wall)]
+        left_wall = [Brick() for _ in range(bricks_per_vertical_wall)]
+        bottom_wall = [Brick() for _ in range(bricks_per_horizontal_wall)]
         for left_brick, right_brick in zip(left_wall, right_wall):
-            x_position = right_brick.rect.x - self.grid_dimensions[0] + (TILE_WIDTH_PIXELS * 2)
-            y_position = right_brick.rect.y
-            left_brick.rect.move_ip(x_position, y_position)
+            x_position = right_brick.x - self.grid_dimensions[0] + (TILE_WIDTH_PIXELS * 2)
+            y_position = right_brick.y
+            left_brick.move_to(x_position, y_position)
         for bottom_brick, top_brick in zip(bottom_wall, top_wall):
-            x_position = top_brick.rect.x
-            y_position = top_brick.rect.y + self.grid_dimensions[1] - (TILE_WIDTH_PIXELS * 2)
-            bottom_brick.rect.move_ip(x_position, y_position)
+            x_position = top_brick.x
+            y_position = top_brick.y + self.grid_dimensions[1] - (TILE_WIDTH_PIXELS * 2)
+            bottom_brick.move_to(x_position, y_position)
         self.bricks = top_wall + right_wall + bottom_wall + left_wall
 
     def change_color(self, color):
-        for brick in self.bricks:
-            brick.image.fill(color, brick.image.get_rect().inflate(-8, -8))
+        self.color = color
+
+    def is_hit_at(self, x, y):
+        return self.mask[(y // TILE_WIDTH_PIXELS) * self._columns + x // TILE_WIDTH_PIXELS]
 
-    def draw(self, surface):
+    def blocks(self):
         for brick in self.bricks:
-            surface.blit(brick.image, brick.rect)
+            yield brick.x, brick.y, brick.size
+        for x, y in self.tiles:
+            yield x, y, TILE_WIDTH_PIXELS
+
+    def _cover(self, x, y, size):
+        """Flag the tiles under a square, the parts of it hanging off one edge of the grid wrapping to the other."""
+        columns = [column % self._columns
+                   for column in range(x // TILE_WIDTH_PIXELS, (x + size - 1) // TILE_WIDTH_PIXELS + 1)]
+        for row in range(y // TILE_WIDTH_PIXELS, (y + size - 1) // TILE_WIDTH_PIXELS + 1):
+            row_start = row % self._rows * self._columns
+            for column in columns:
+                self.mask[row_start + column] = 1
 
 
 class Brick():
     """A small square barrier. The game ends if the snake touches it."""
-    def __init__(self, color):
-        self.image = pygame.Surface((TILE_WIDTH_PIXELS * 2, TILE_WIDTH_PIXELS * 2)).convert()
-        self.image.fill(BLACK)
-        self.image.fill(color, self.image.get_rect().inflate(-8, -8))
-        self.rect = self.image.get_rect()
+    size = TILE_WIDTH_PIXELS * 2
+
+    def __init__(self):
+        self.x = 0
+        self.y = 0
 
     def move_to(self, x, y):
-        self.rect.topleft = x, y
+        self.x = x
+        self.y = y
 
-    def draw(self, surface):
-        surface.blit(self.image, self.rect)
 
-    def change_color(self, color):
-        self.image.fill(color, self.image.get_rect().inflate(-8, -8))
\ No newline at end of file
+class WallMap:
+    """
+    A layout of walls for the grid, compiled into a mask with a flag for every tile.
+
+    Maps are plain text files with a line for every row of tiles, "#" for a tile of wall and "." for an
+    open one. Lines starting with ";" are comments. The map sets the size of the grid it is played on.
+
+    ...
+
+    Attributes
+    ----------
+    name : str
+        where the map was loaded from
+    columns : int
+        the number of tiles across the map
+    rows : int
+        the number of tiles down the map
+    mask : bytearray
+        for every tile, indexed by row * columns + column, whether it is wall
+
+    Methods
+    -------
+    packed()
+        the mask with a bit per tile, as stored in replays
+    """
+    def __init__(self, name, columns, rows, mask):
+        self.name = name
+        self.columns = columns
+        self.rows = rows
+        self.mask = mask
+
+    def packed(self):
+        packed = bytearray((len(self.mask) + 7) // 8)
+        for tile, is_wall in enumerate(self.mask):
+            if is_wall:
+                packed[tile // 8] |= 1 << (tile % 8)
+        return bytes(packed)
+
+
+def load_wall_map(path):
+    """Compile a map file into a WallMap."""
+    with open(path) as map_file:
+        lines = [line for line in map_file.read().splitlines() if not line.startswith(";")]
+    while lines and not lines[-1]:
+        lines.pop()
+    if not lines or any(len(line) != len(lines[0]) for line in lines):
+        raise ValueError("{} is not a rectangular map".format(path))
+    if set("".join(lines)) - {WALL_MAP_WALL, WALL_MAP_OPEN}:
+        raise ValueError("{} holds characters other than {!r} and {!r}".format(path, WALL_MAP_WALL, WALL_MAP_OPEN))
+    mask = bytearray(character == WALL_MAP_WALL for line in lines for character in line)
+    return WallMap(path, len(lines[0]), len(lines), mask)
+
+
+def unpack_wall_map(name, columns, rows, packed):
+    """Rebuild a WallMap from its packed mask."""
+    mask = bytearray((packed[tile // 8] >> (tile % 8)) & 1 for tile in range(columns * rows))
+    return WallMap(name, columns, rows, mask)